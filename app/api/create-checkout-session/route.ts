@@ -4,10 +4,24 @@ import Stripe from 'stripe';
 // Lazy initialize Stripe to avoid build-time errors
 let stripe: Stripe | null = null;
 
+// STRIPE_API_BASE points the client at a local stand-in (e2e-tests/load_test_api.py)
+function getStripeHost(): Stripe.StripeConfig {
+  if (!process.env.STRIPE_API_BASE) {
+    return {};
+  }
+  const base = new URL(process.env.STRIPE_API_BASE);
+  return {
+    host: base.hostname,
+    port: base.port ? Number(base.port) : undefined,
+    protocol: base.protocol === 'http:' ? 'http' : 'https',
+  };
+}
+
 function getStripe() {
   if (!stripe && process.env.STRIPE_SECRET_KEY) {
     stripe = new Stripe(process.env.STRIPE_SECRET_KEY, {
       apiVersion: '2025-12-15.clover',
+      ...getStripeHost(),
     });
   }
   return stripe;
@@ -3,7 +3,7 @@ import { Analytics } from '@vercel/analytics/react'
 import { SpeedInsights } from '@vercel/speed-insights/next'
 import { ThemeProvider } from '@/lib/theme-context'
 import { Providers } from '@/components/providers'
-import { GoogleAnalytics } from '@/components/analytics'
+import { BehaviorTracker, GoogleAnalytics } from '@/components/analytics'
 import Hotjar from '@/components/analytics/Hotjar'
 import ScrollDepthTracker from '@/components/analytics/ScrollDepthTracker'
 import './globals.css'
@@ -156,6 +156,8 @@ export default function RootLayout({
         <GoogleAnalytics />
         <Hotjar />
         <ScrollDepthTracker />
+        {/* First-party behavior tracking is opt-in (e2e-tests/benchmark_analytics_overhead.py) */}
+        {process.env.NEXT_PUBLIC_BEHAVIOR_TRACKING === 'true' && <BehaviorTracker />}
       </body>
     </html>
   )
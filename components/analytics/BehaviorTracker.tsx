@@ -35,6 +35,18 @@ import { initSession, trackPageView, getSessionId } from '@/lib/analytics/sessio
  * </body>
  */
 
+// Set to 'true' in localStorage to turn tracking off for this browser
+// (e2e-tests/benchmark_analytics_overhead.py uses it for its analytics-off runs)
+const OPT_OUT_KEY = 'poolapp-behavior-opt-out';
+
+function isOptedOut(): boolean {
+  try {
+    return localStorage.getItem(OPT_OUT_KEY) === 'true';
+  } catch {
+    return false;
+  }
+}
+
 interface BehaviorTrackerProps {
   /**
    * Track mouse movements (can impact performance)
@@ -85,6 +97,8 @@ export default function BehaviorTracker({
 
   // Initialize session and behavior tracking on mount
   useEffect(() => {
+    if (isOptedOut()) return;
+
     initSession();
     initBehaviorTracking({
       trackScroll,
@@ -107,6 +121,8 @@ export default function BehaviorTracker({
 
   // Track page views on route change
   useEffect(() => {
+    if (isOptedOut()) return;
+
     trackPageView(pathname);
     if (debug) {
       console.log('[BehaviorTracker] Page view:', pathname);
@@ -115,7 +131,7 @@ export default function BehaviorTracker({
 
   // Set up form tracking
   useEffect(() => {
-    if (!trackForms) return;
+    if (!trackForms || isOptedOut()) return;
 
     const handleFocus = (e: FocusEvent) => {
       const target = e.target as HTMLElement;
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+PoolApp Demo Session Cache
+Logs in through /login once per base URL, saves the resulting browser state
+and hands out already-logged-in contexts, so use cases that need the
+dashboard do not log in again or depend on what ran before them.
+
+The demo login lives in sessionStorage (lib/demo-session.ts), which
+Playwright's storage_state() does not capture, so it is saved alongside the
+storage state and restored with an init script on the app's origin.
+"""
+
+import fcntl
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+AUTH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".auth")
+
+# Must match app/login/page.tsx
+DEMO_EMAIL = "demo@poolops.io"
+DEMO_PASSWORD = "demo123"
+DEMO_MODE_KEY = "poolapp-demo-mode"
+
+# Saved sessions older than this are replaced by a fresh login
+SESSION_TTL = 60 * 60
+
+# Restores the saved sessionStorage once per tab, so a use case that logs out
+# stays logged out when it navigates again
+RESTORE_SCRIPT = """
+(([origin, saved]) => {
+  if (location.origin !== origin || sessionStorage.getItem('__e2e_session_restored')) {
+    return;
+  }
+  for (const [key, value] of Object.entries(saved)) {
+    sessionStorage.setItem(key, value);
+  }
+  sessionStorage.setItem('__e2e_session_restored', '1');
+})(%s);
+"""
+
+_lock = threading.Lock()
+_sessions = {}
+
+def session_path(base_url):
+    """Where the saved session for a base URL lives"""
+    return os.path.join(AUTH_DIR, f"session-{urlparse(base_url).netloc.replace(':', '_')}.json")
+
+def is_valid(session, base_url):
+    """True if a saved session belongs to base_url, is logged in and has not expired"""
+    return (
+        session is not None
+        and session.get("base_url") == base_url
+        and session.get("expires_at", 0) > time.time()
+        and session.get("session_storage", {}).get(DEMO_MODE_KEY) == "true"
+    )
+
+def load_session(base_url):
+    """Read the saved session for base_url, or None if missing or stale"""
+    path = session_path(base_url)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return session if is_valid(session, base_url) else None
+
+def save_session(session):
+    """Write atomically so parallel runs never read a half-written file"""
+    os.makedirs(AUTH_DIR, exist_ok=True)
+    path = session_path(session["base_url"])
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(session, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+def login(browser, base_url):
+    """Log in with the demo account and capture the resulting browser state"""
+    context = browser.new_context(viewport={"width": 1280, "height": 720})
+    try:
+        page = context.new_page()
+        page.goto(f"{base_url}/login", wait_until="networkidle")
+        page.locator("input[type='email']").first.fill(DEMO_EMAIL)
+        page.locator("input[type='password']").first.fill(DEMO_PASSWORD)
+        page.locator("button[type='submit']").first.click()
+        try:
+            page.wait_for_url("**/dashboard", timeout=15000)
+        except Exception:
+            raise RuntimeError(f"Demo login did not reach /dashboard (ended on {page.url})")
+
+        created = time.time()
+        return {
+            "base_url": base_url,
+            "created_at": created,
+            "expires_at": created + SESSION_TTL,
+            "storage_state": context.storage_state(),
+            "session_storage": page.evaluate("() => Object.fromEntries(Object.entries(sessionStorage))"),
+        }
+    finally:
+        context.close()
+
+def ensure_session(browser, base_url, refresh=False):
+    """Return a valid session for base_url, logging in only when needed
+
+    A thread lock covers threads in this process and a lock file next to the
+    saved session covers other processes, so a parallel run logs in once.
+    """
+    with _lock:
+        session = None if refresh else _sessions.get(base_url)
+        if is_valid(session, base_url):
+            return session
+        os.makedirs(AUTH_DIR, exist_ok=True)
+        with open(f"{session_path(base_url)}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Another process may have logged in while we waited for the lock
+                session = None if refresh else load_session(base_url)
+                if session is None:
+                    print(f"Logging in to {base_url} as {DEMO_EMAIL}...")
+                    session = login(browser, base_url)
+                    save_session(session)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        _sessions[base_url] = session
+        return session
+
+def new_context(browser, base_url, **kwargs):
+    """A browser context that starts out logged in to base_url"""
+    session = ensure_session(browser, base_url)
+    context = browser.new_context(storage_state=session["storage_state"], **kwargs)
+    origin = f"{urlparse(base_url).scheme}://{urlparse(base_url).netloc}"
+    context.add_init_script(RESTORE_SCRIPT % json.dumps([origin, session["session_storage"]]))
+    return context
+
+if __name__ == "__main__":
+    # Refresh the saved session ahead of a run: python auth_session.py [base_url]
+    from playwright.sync_api import sync_playwright
+    url = sys.argv[1].rstrip("/") if len(sys.argv) > 1 else "https://poolapp-tau.vercel.app"
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        ensure_session(browser, url, refresh=True)
+        browser.close()
+    print(f"Session saved to {session_path(url)}")
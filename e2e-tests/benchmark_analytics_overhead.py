@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+PoolApp Analytics Overhead Benchmark
+Replays scripted interaction traces (scrolling, mouse movement, clicks, form
+filling) with analytics on and with analytics off, and reports what the
+instrumentation costs: main-thread time, input latency, analytics queue
+growth and beacon payload bytes. A run that fails is recorded in the report
+and the benchmark carries on with the rest.
+
+"Off" blocks the analytics scripts and first-party analytics endpoints at the
+network layer, so the delta is the cost of everything the layout ships for
+analytics (GA, Hotjar, Vercel Analytics/Speed Insights, scroll tracking).
+
+BehaviorTracker (lib/analytics/behavior.ts) is only mounted when the app is
+built with NEXT_PUBLIC_BEHAVIOR_TRACKING=true. To measure its sampling and
+batching, run against such a build, e.g. a local `next start`:
+    python benchmark_analytics_overhead.py --base-url http://localhost:3000 --behavior-tracker
+Off runs then also opt the tracker out through its localStorage switch.
+"""
+
+from playwright.sync_api import sync_playwright
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from statistics import median
+
+BASE_URL = "https://poolapp-tau.vercel.app"
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+RUNS = 3
+# Quiet time after a trace; with BehaviorTracker, long enough for its 5s batch timer
+SETTLE_MS = 1000
+TRACKER_FLUSH_MS = 6000
+
+# Must match components/analytics/BehaviorTracker.tsx and lib/analytics/session.ts
+TRACKER_OPT_OUT_SCRIPT = "localStorage.setItem('poolapp-behavior-opt-out', 'true');"
+TRACKER_ACTIVE_SCRIPT = "localStorage.getItem('poolapp_session') !== null"
+# Where lib/analytics/behavior.ts posts its batches, as {"events": [...]}
+BEHAVIOR_ENDPOINT = "/api/analytics/behavior"
+
+# Scrolls the first heading or paragraph outside any link or button into view
+# and returns its box, so clicks on it cannot navigate
+INERT_TARGET_SCRIPT = """
+() => {
+  const el = [...document.querySelectorAll('main h1, main h2, main p, h1, h2, p')]
+    .find((e) => !e.closest('a, button, label, [role="button"], [onclick]') && e.offsetParent !== null);
+  if (!el) return null;
+  el.scrollIntoView({ block: 'center' });
+  const r = el.getBoundingClientRect();
+  return { x: r.left, y: r.top, width: r.width, height: r.height };
+}
+"""
+
+# Third-party analytics hosts and first-party beacon endpoints
+ANALYTICS_PATTERN = re.compile(
+    r"googletagmanager\.com|google-analytics\.com|analytics\.google\.com|hotjar\.(com|io)"
+    r"|/_vercel/insights|/_vercel/speed-insights|/api/analytics"
+)
+
+# Records long tasks and input event timings from the start of the page
+OBSERVERS_SCRIPT = """
+(() => {
+  window.__bench = { longTasks: [], events: [] };
+  try {
+    new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        window.__bench.longTasks.push(entry.duration);
+      }
+    }).observe({ type: 'longtask', buffered: true });
+    new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        window.__bench.events.push({
+          name: entry.name,
+          delay: entry.processingStart - entry.startTime,
+          duration: entry.duration,
+        });
+      }
+    }).observe({ type: 'event', buffered: true, durationThreshold: 16 });
+  } catch (e) {}
+})();
+"""
+
+SNAPSHOT_SCRIPT = """
+() => ({
+  longTasks: window.__bench ? window.__bench.longTasks.length : 0,
+  events: window.__bench ? window.__bench.events.length : 0,
+  dataLayer: (window.dataLayer || []).length,
+  hotjarQueue: (window.hj && window.hj.q) ? window.hj.q.length : 0,
+})
+"""
+
+def trace_scroll(page):
+    """Wheel down the page and back up"""
+    for _ in range(30):
+        page.mouse.wheel(0, 300)
+        page.wait_for_timeout(50)
+    for _ in range(10):
+        page.mouse.wheel(0, -900)
+        page.wait_for_timeout(50)
+
+def trace_mouse(page):
+    """Sweep the pointer across the viewport"""
+    width, height = 1280, 720
+    for i in range(20):
+        y = 40 + (i * 33) % (height - 80)
+        page.mouse.move(20, y)
+        page.mouse.move(width - 20, y, steps=25)
+
+def trace_clicks(page):
+    """Ordinary clicks followed by a rage-click burst on an inert text block"""
+    box = page.evaluate(INERT_TARGET_SCRIPT)
+    if box is None:
+        raise RuntimeError("No inert element to click on")
+    y = box["y"] + box["height"] / 2
+    for fraction in (0.2, 0.4, 0.6, 0.8):
+        page.mouse.click(box["x"] + box["width"] * fraction, y)
+        page.wait_for_timeout(300)
+    for _ in range(5):
+        page.mouse.click(box["x"] + box["width"] / 2, y)
+        page.wait_for_timeout(60)
+
+def trace_form(page):
+    """Type into the login form field by field"""
+    email = page.locator("input[type='email']").first
+    password = page.locator("input[type='password']").first
+    email.click()
+    email.type("dispatcher@poolcompany.com", delay=40)
+    password.click()
+    password.type("not-the-real-password", delay=40)
+    email.click()
+
+# name: (path, trace)
+TRACES = {
+    "scroll": ("", trace_scroll),
+    "mouse": ("/dashboard", trace_mouse),
+    "clicks": ("/", trace_clicks),
+    "form": ("/login", trace_form),
+}
+
+def cdp_metrics(cdp):
+    """Chromium's cumulative main-thread counters, in milliseconds"""
+    metrics = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+    return {
+        "task_ms": metrics.get("TaskDuration", 0) * 1000,
+        "script_ms": metrics.get("ScriptDuration", 0) * 1000,
+        "layout_ms": metrics.get("LayoutDuration", 0) * 1000,
+    }
+
+def run_trace(browser, base_url, name, analytics, tracker_flush=False):
+    """Run one trace in a fresh context and measure what happened during it
+
+    Returns None if the trace navigated away, since that resets the counters.
+    """
+    path, trace = TRACES[name]
+    context = browser.new_context(viewport={"width": 1280, "height": 720})
+    context.add_init_script(OBSERVERS_SCRIPT)
+    if not analytics:
+        context.add_init_script(TRACKER_OPT_OUT_SCRIPT)
+
+    beacons = []
+    behavior_events = []
+    blocked = []
+
+    def on_request(request):
+        if ANALYTICS_PATTERN.search(request.url) and request.resource_type != "script":
+            body = request.post_data_buffer or b""
+            query = request.url.split("?", 1)[1] if "?" in request.url else ""
+            beacons.append(len(body) + len(query))
+            if BEHAVIOR_ENDPOINT in request.url and body:
+                try:
+                    behavior_events.append(len(json.loads(body).get("events", [])))
+                except (ValueError, AttributeError):
+                    pass
+
+    def block_analytics(route):
+        blocked.append(route.request.url)
+        route.abort()
+
+    if not analytics:
+        context.route(ANALYTICS_PATTERN, block_analytics)
+
+    try:
+        page = context.new_page()
+        page.on("request", on_request)
+        cdp = context.new_cdp_session(page)
+        cdp.send("Performance.enable")
+
+        page.goto(f"{base_url}{path}", wait_until="networkidle")
+        page.wait_for_timeout(SETTLE_MS)
+        start_url = page.url
+        tracker = page.evaluate(TRACKER_ACTIVE_SCRIPT)
+
+        before = cdp_metrics(cdp)
+        snapshot = page.evaluate(SNAPSHOT_SCRIPT)
+        beacons_before = len(beacons)
+        behavior_before = len(behavior_events)
+
+        trace(page)
+        page.wait_for_timeout(TRACKER_FLUSH_MS if tracker_flush else SETTLE_MS)
+        if page.url != start_url:
+            print(f"  discarded: trace navigated to {page.url}")
+            return None
+
+        after = cdp_metrics(cdp)
+        final = page.evaluate(SNAPSHOT_SCRIPT)
+        long_tasks = page.evaluate(f"window.__bench.longTasks.slice({snapshot['longTasks']})")
+        events = page.evaluate(f"window.__bench.events.slice({snapshot['events']})")
+    finally:
+        context.close()
+
+    trace_beacons = beacons[beacons_before:]
+    delays = sorted(e["delay"] for e in events)
+    durations = sorted(e["duration"] for e in events)
+    return {
+        "main_thread_ms": after["task_ms"] - before["task_ms"],
+        "script_ms": after["script_ms"] - before["script_ms"],
+        "layout_ms": after["layout_ms"] - before["layout_ms"],
+        "long_task_ms": sum(long_tasks),
+        "total_blocking_ms": sum(max(0, t - 50) for t in long_tasks),
+        "slow_events": len(events),
+        "input_delay_p95_ms": _percentile(delays, 0.95),
+        "event_duration_p95_ms": _percentile(durations, 0.95),
+        "queue_growth": {
+            "dataLayer": final["dataLayer"] - snapshot["dataLayer"],
+            "hotjar": final["hotjarQueue"] - snapshot["hotjarQueue"],
+            # Events BehaviorTracker batched and sent during the trace
+            "behavior": sum(behavior_events[behavior_before:]),
+        },
+        "beacons": len(trace_beacons),
+        "beacon_bytes": sum(trace_beacons),
+        "blocked_requests": len(blocked),
+        "behavior_tracker": tracker,
+    }
+
+def _percentile(values, q):
+    if not values:
+        return 0
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+def summarize(runs):
+    """Median of every numeric field across repeated runs"""
+    summary = {}
+    for key in runs[0]:
+        if isinstance(runs[0][key], dict):
+            summary[key] = {k: median(r[key][k] for r in runs) for k in runs[0][key]}
+        elif isinstance(runs[0][key], bool):
+            summary[key] = any(r[key] for r in runs)
+        else:
+            summary[key] = median(r[key] for r in runs)
+    return summary
+
+def main():
+    """Run every trace with analytics on and off"""
+    parser = argparse.ArgumentParser(description="Measure analytics instrumentation overhead")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--traces", nargs="+", choices=sorted(TRACES), default=sorted(TRACES))
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--behavior-tracker", action="store_true",
+                        help="Target is built with NEXT_PUBLIC_BEHAVIOR_TRACKING=true; fail if the tracker is missing")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("POOLAPP ANALYTICS OVERHEAD BENCHMARK")
+    print(f"Testing: {args.base_url}")
+    print(f"Started: {datetime.now().isoformat()}")
+    print("="*60 + "\n")
+
+    results = {}
+    failures = []
+    tracker_seen = False
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        for name in args.traces:
+            results[name] = {}
+            # Alternate modes so drift on the target affects both equally
+            runs = {"on": [], "off": []}
+            for run in range(args.runs):
+                for mode in ("on", "off"):
+                    print(f"Trace {name}, analytics {mode}, run {run + 1}/{args.runs}...")
+                    try:
+                        result = run_trace(browser, args.base_url, name, analytics=(mode == "on"),
+                                           tracker_flush=args.behavior_tracker)
+                    except Exception as e:
+                        print(f"  failed: {e}")
+                        failures.append({"trace": name, "mode": mode, "run": run + 1, "error": str(e)})
+                        continue
+                    if result is not None:
+                        runs[mode].append(result)
+                        tracker_seen = tracker_seen or (mode == "on" and result["behavior_tracker"])
+            if not runs["on"] or not runs["off"]:
+                print(f"Trace {name}: no usable runs, skipped")
+                del results[name]
+                continue
+            results[name]["on"] = summarize(runs["on"])
+            results[name]["off"] = summarize(runs["off"])
+            results[name]["overhead"] = {
+                key: results[name]["on"][key] - results[name]["off"][key]
+                for key in ("main_thread_ms", "script_ms", "long_task_ms", "total_blocking_ms",
+                            "input_delay_p95_ms", "event_duration_p95_ms")
+            }
+        browser.close()
+
+    print("\n" + "="*60)
+    print("ANALYTICS OVERHEAD (analytics on - off, medians)")
+    print("="*60)
+    print(f"{'trace':<8} {'main ms':>8} {'script':>8} {'TBT':>6} {'delay95':>8} {'beacons':>8} {'bytes':>8} {'queue':>6}")
+    for name, result in results.items():
+        overhead, on = result["overhead"], result["on"]
+        print(
+            f"{name:<8} {overhead['main_thread_ms']:>+8.1f} {overhead['script_ms']:>+8.1f} "
+            f"{overhead['total_blocking_ms']:>+6.0f} {overhead['input_delay_p95_ms']:>+8.1f} "
+            f"{on['beacons']:>8.0f} {on['beacon_bytes']:>8.0f} {sum(on['queue_growth'].values()):>6.0f}"
+        )
+    if failures:
+        print(f"{len(failures)} run(s) failed and were left out:")
+        for failure in failures:
+            print(f"  {failure['trace']} {failure['mode']} run {failure['run']}: {failure['error'][:80]}")
+    if not tracker_seen:
+        print("NOTE: BehaviorTracker is not mounted on this target, so lib/analytics/behavior.ts")
+        print("      sampling and batching are NOT measured (see --behavior-tracker)")
+    print("="*60)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(OUTPUT_DIR, f"analytics_overhead_{stamp}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "base_url": args.base_url,
+            "runs": args.runs,
+            "behavior_tracker_measured": tracker_seen,
+            "traces": results,
+            "failures": failures,
+        }, f, indent=2)
+    print(f"\nResults saved to {path}")
+    if args.behavior_tracker and not tracker_seen:
+        print("ERROR: --behavior-tracker given but the tracker never initialized on the target")
+        sys.exit(1)
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+PoolApp Large-Dataset Rendering Benchmark
+Fills /customers and /invoices with generated datasets of increasing size
+and measures how the list pages scale, so we know when they need virtualization.
+
+The pages read their data from browser storage (see lib/customers-context.tsx
+and lib/invoices-context.tsx), so the stand-in is an init script that serves
+the generated dataset for those storage keys instead of the demo data.
+"""
+
+from playwright.sync_api import sync_playwright
+import argparse
+import json
+import math
+import os
+import random
+from datetime import date, datetime, timedelta
+
+BASE_URL = "https://poolapp-tau.vercel.app"
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+CUSTOMER_SIZES = [10, 100, 1000, 2500, 5000]
+INVOICE_SIZES = [100, 1000, 5000, 10000, 25000]
+
+# Thresholds used to call out the size where a list needs virtualization
+TTFR_BUDGET_MS = 1000
+MIN_SCROLL_FPS = 50
+INTERACTION_BUDGET_MS = 100
+DOM_NODE_BUDGET = 15000
+
+SEED = 20260126
+
+TECHNICIANS = ["Mike Rodriguez", "Sarah Chen", "Jake Thompson"]
+CITIES = [
+    "Wilmington, DE 19802",
+    "Greenville, DE 19807",
+    "Newark, DE 19711",
+    "Hockessin, DE 19707",
+    "Dover, DE 19901",
+    "Lewes, DE 19958",
+    "Rehoboth Beach, DE 19971",
+]
+STREETS = ["Baynard Blvd", "Kennett Pike", "Lancaster Ave", "Limestone Rd", "Market St", "Savannah Rd"]
+SURNAMES = [
+    "Johnson", "Williams", "Brown", "Davis", "Miller", "Wilson", "Moore",
+    "Taylor", "Anderson", "Thomas", "Jackson", "Martin", "Lee", "Harris",
+]
+
+PAGES = {
+    "customers": {
+        "path": "/customers",
+        "storage_key": "poolapp_customers",
+        "row_selector": "main div.space-y-6 > div.space-y-3 > div",
+        # Generated names are "<Surname> Family 00001"; the demo data has no numbered families
+        "row_marker": r"Family \d{5}",
+        "search_selector": "input[placeholder^='Search customers']",
+        "search_value": "Dover",
+        "filter_selector": "main select",
+        "filter_value": "critical",
+        "sizes": CUSTOMER_SIZES,
+    },
+    "invoices": {
+        "path": "/invoices",
+        "storage_key": "poolapp-invoices",
+        "row_selector": "main tbody tr",
+        # Generated ids are INV-000001; the server-rendered demo invoices are INV-001
+        "row_marker": r"INV-\d{6}",
+        "search_selector": "input[placeholder^='Search invoices']",
+        "search_value": "Johnson",
+        "filter_selector": "main select",
+        "filter_value": "overdue",
+        "sizes": INVOICE_SIZES,
+    },
+}
+
+# Serves the generated dataset for the benchmarked storage key and keeps the
+# page's write-backs in memory, so large datasets never hit the storage quota.
+# Also records when the first row of the generated data is attached to the DOM;
+# rows from the built-in demo data (server-rendered for /invoices) are ignored.
+STAND_IN_SCRIPT = """
+(() => {
+  const seeded = { [%(key)s]: %(value)s };
+  const memory = {};
+  const getItem = Storage.prototype.getItem;
+  const setItem = Storage.prototype.setItem;
+  Storage.prototype.getItem = function (key) {
+    if (key in memory) return memory[key];
+    if (key in seeded) return seeded[key];
+    return getItem.call(this, key);
+  };
+  Storage.prototype.setItem = function (key, value) {
+    if (key in seeded) { memory[key] = String(value); return; }
+    return setItem.call(this, key, value);
+  };
+
+  window.__benchFirstRow = null;
+  const selector = %(row_selector)s;
+  const marker = new RegExp(%(row_marker)s);
+  const hasBenchRow = (node) => {
+    if (node.nodeType !== 1) return false;
+    const rows = node.matches(selector) ? [node] : node.querySelectorAll(selector);
+    for (const row of rows) {
+      if (marker.test(row.textContent)) return true;
+    }
+    return false;
+  };
+  const observer = new MutationObserver((records) => {
+    for (const record of records) {
+      for (const node of record.addedNodes) {
+        if (hasBenchRow(node)) {
+          window.__benchFirstRow = performance.now();
+          observer.disconnect();
+          return;
+        }
+      }
+    }
+  });
+  observer.observe(document, { childList: true, subtree: true });
+})();
+"""
+
+SCROLL_SCRIPT = """
+async (maxMs) => {
+  const frames = [];
+  const maxY = document.documentElement.scrollHeight - window.innerHeight;
+  const step = Math.max(200, Math.ceil(maxY / 240));
+  return await new Promise((resolve) => {
+    let start = null;
+    let last = null;
+    function tick(now) {
+      if (start === null) { start = now; last = now; }
+      else { frames.push(now - last); last = now; }
+      window.scrollBy(0, step);
+      if (window.scrollY >= maxY - 1 || now - start > maxMs) {
+        const elapsed = Math.max(now - start, 1);
+        resolve({
+          frames: frames.length,
+          elapsed_ms: elapsed,
+          fps: frames.length * 1000 / elapsed,
+          long_frames: frames.filter((f) => f > 50).length,
+        });
+      } else {
+        requestAnimationFrame(tick);
+      }
+    }
+    requestAnimationFrame(tick);
+  });
+}
+"""
+
+# Sets a control's value the way React expects and returns the time until the
+# frame after the resulting re-render.
+INTERACTION_SCRIPT = """
+async ({ selector, value }) => {
+  const el = document.querySelector(selector);
+  if (!el) return null;
+  const proto = el.tagName === 'SELECT' ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+  const setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+  const t0 = performance.now();
+  setter.call(el, value);
+  el.dispatchEvent(new Event(el.tagName === 'SELECT' ? 'change' : 'input', { bubbles: true }));
+  await new Promise((resolve) => requestAnimationFrame(() => setTimeout(resolve, 0)));
+  return performance.now() - t0;
+}
+"""
+
+def generate_customers(count, rng):
+    """Generate customers shaped like lib/customers-context.tsx Customer"""
+    today = date(2026, 1, 26)
+    customers = []
+    for i in range(1, count + 1):
+        surname = rng.choice(SURNAMES)
+        frequency = rng.choice(["weekly", "weekly", "bi-weekly", "monthly"])
+        last_service = today - timedelta(days=rng.randint(0, 13))
+        ph = round(rng.uniform(6.8, 8.4), 1)
+        chlorine = round(rng.uniform(0.5, 5.0), 1)
+        roll = rng.random()
+        status = "critical" if roll < 0.1 else "attention" if roll < 0.3 else "healthy"
+        customer = {
+            "id": f"bench-cust-{i}",
+            "name": f"{surname} Family {i:05d}",
+            "address": f"{rng.randint(100, 9999)} {rng.choice(STREETS)}",
+            "city": rng.choice(CITIES),
+            "phone": f"(302) 555-{rng.randint(0, 9999):04d}",
+            "email": f"{surname.lower()}{i}@email.com",
+            "type": "commercial" if rng.random() < 0.15 else "residential",
+            "serviceFrequency": frequency,
+            "lastServiceDate": last_service.isoformat(),
+            "nextServiceDate": (last_service + timedelta(days=7)).isoformat(),
+            "chemistry": {
+                "ph": ph,
+                "chlorine": chlorine,
+                "alkalinity": rng.randint(70, 140),
+                "lastReadingDate": last_service.isoformat(),
+            },
+            "chemistryStatus": status,
+            "monthlyRate": rng.choice([180, 240, 320, 480, 660]),
+            "assignedTech": rng.choice(TECHNICIANS),
+            "lat": round(39.15 + rng.uniform(0, 0.7), 5),
+            "lng": round(-75.75 + rng.uniform(0, 0.7), 5),
+        }
+        if status == "critical":
+            customer["chemistryAlert"] = f"pH {ph} at {surname} - needs attention"
+        customers.append(customer)
+    return customers
+
+def generate_invoices(count, rng):
+    """Generate invoices shaped like lib/invoices-context.tsx Invoice"""
+    today = date(2026, 1, 26)
+    invoices = []
+    for i in range(1, count + 1):
+        surname = rng.choice(SURNAMES)
+        issued = today - timedelta(days=rng.randint(0, 365))
+        amount = rng.choice([145, 165, 185, 235, 320])
+        roll = rng.random()
+        status = "paid" if roll < 0.75 else "pending" if roll < 0.92 else "overdue"
+        invoice = {
+            "id": f"INV-{i:06d}",
+            "customerId": f"bench-cust-{rng.randint(1, max(count // 5, 1))}",
+            "customerName": f"{surname} Family",
+            "customerEmail": f"{surname.lower()}@email.com",
+            "date": issued.isoformat(),
+            "dueDate": (issued + timedelta(days=14)).isoformat(),
+            "lineItems": [
+                {"id": f"li-{i:06d}", "description": "Weekly Pool Service", "amount": amount},
+            ],
+            "total": amount,
+            "status": status,
+        }
+        if status == "paid":
+            speed = rng.randint(1, 10)
+            invoice["paidDate"] = (issued + timedelta(days=speed)).isoformat()
+            invoice["paymentSpeed"] = speed
+        invoices.append(invoice)
+    return invoices
+
+GENERATORS = {
+    "customers": generate_customers,
+    "invoices": generate_invoices,
+}
+
+def measure_interaction(page, selector, value):
+    """Time a search/filter change in the page, in milliseconds"""
+    return page.evaluate(INTERACTION_SCRIPT, {"selector": selector, "value": value})
+
+def benchmark_size(browser, base_url, name, config, size):
+    """Load one page with a generated dataset of the given size and measure it"""
+    dataset = GENERATORS[name](size, random.Random(SEED + size))
+    context = browser.new_context(viewport={"width": 1280, "height": 720})
+    context.add_init_script(STAND_IN_SCRIPT % {
+        "key": json.dumps(config["storage_key"]),
+        "value": json.dumps(json.dumps(dataset)),
+        "row_selector": json.dumps(config["row_selector"]),
+        "row_marker": json.dumps(config["row_marker"]),
+    })
+    page = context.new_page()
+
+    result = {"page": name, "size": size}
+    try:
+        page.goto(f"{base_url}{config['path']}", wait_until="domcontentloaded")
+        page.wait_for_function("window.__benchFirstRow !== null", timeout=120000)
+        page.wait_for_load_state("networkidle")
+
+        result["time_to_first_row_ms"] = page.evaluate("window.__benchFirstRow")
+        result["rows_rendered"] = page.locator(config["row_selector"]).count()
+        result["dom_nodes"] = page.evaluate("document.getElementsByTagName('*').length")
+
+        result["scroll"] = page.evaluate(SCROLL_SCRIPT, 5000)
+        page.evaluate("window.scrollTo(0, 0)")
+
+        result["search_ms"] = measure_interaction(page, config["search_selector"], config["search_value"])
+        measure_interaction(page, config["search_selector"], "")
+        result["filter_ms"] = measure_interaction(page, config["filter_selector"], config["filter_value"])
+        measure_interaction(page, config["filter_selector"], "all")
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        context.close()
+
+    return result
+
+def needs_virtualization(result):
+    """Return the budgets a measurement blows through"""
+    reasons = []
+    if (result.get("time_to_first_row_ms") or 0) > TTFR_BUDGET_MS:
+        reasons.append("time-to-first-row")
+    if result.get("scroll") and result["scroll"]["fps"] < MIN_SCROLL_FPS:
+        reasons.append("scroll fps")
+    if max(result.get("search_ms") or 0, result.get("filter_ms") or 0) > INTERACTION_BUDGET_MS:
+        reasons.append("search/filter latency")
+    if (result.get("dom_nodes") or 0) > DOM_NODE_BUDGET:
+        reasons.append("dom size")
+    return reasons
+
+def render_chart(results, path):
+    """Write the scaling curves as a standalone SVG (one panel per metric)"""
+    metrics = [
+        ("time_to_first_row_ms", "Time to first row (ms)", lambda r: r.get("time_to_first_row_ms")),
+        ("fps", "Scroll FPS", lambda r: r.get("scroll", {}).get("fps")),
+        ("search_ms", "Search latency (ms)", lambda r: r.get("search_ms")),
+        ("filter_ms", "Filter latency (ms)", lambda r: r.get("filter_ms")),
+        ("dom_nodes", "DOM nodes", lambda r: r.get("dom_nodes")),
+    ]
+    colors = {"customers": "#2563eb", "invoices": "#dc2626"}
+    panel_w, panel_h, pad = 360, 220, 40
+    width = panel_w * len(metrics)
+    height = panel_h + 30
+    sizes = sorted({r["size"] for r in results})
+    log_min, log_max = _log10(min(sizes)), _log10(max(sizes))
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="sans-serif" font-size="11">',
+        f'<rect width="{width}" height="{height}" fill="white"/>',
+    ]
+    for index, (_, title, getter) in enumerate(metrics):
+        x0 = index * panel_w
+        values = [getter(r) for r in results if getter(r) is not None]
+        top = max(values) if values else 1
+        top = top or 1
+        parts.append(f'<text x="{x0 + pad}" y="16" font-weight="bold">{title}</text>')
+        parts.append(
+            f'<rect x="{x0 + pad}" y="24" width="{panel_w - 2 * pad}" height="{panel_h - pad}" '
+            f'fill="none" stroke="#cbd5e1"/>'
+        )
+        parts.append(f'<text x="{x0 + 2}" y="30">{top:.0f}</text>')
+        parts.append(f'<text x="{x0 + 2}" y="{panel_h - pad + 24}">0</text>')
+        for page_name, color in colors.items():
+            points = []
+            for r in sorted((r for r in results if r["page"] == page_name), key=lambda r: r["size"]):
+                value = getter(r)
+                if value is None:
+                    continue
+                span = (log_max - log_min) or 1
+                x = x0 + pad + (panel_w - 2 * pad) * (_log10(r["size"]) - log_min) / span
+                y = 24 + (panel_h - pad) * (1 - value / top)
+                points.append(f"{x:.1f},{y:.1f}")
+                parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3" fill="{color}"/>')
+            if points:
+                parts.append(f'<polyline points="{" ".join(points)}" fill="none" stroke="{color}" stroke-width="2"/>')
+        parts.append(f'<text x="{x0 + pad}" y="{panel_h + 2}">{min(sizes)}</text>')
+        parts.append(f'<text x="{x0 + panel_w - pad}" y="{panel_h + 2}" text-anchor="end">{max(sizes)} rows (log)</text>')
+
+    legend_x = 10
+    for page_name, color in colors.items():
+        parts.append(f'<rect x="{legend_x}" y="{height - 14}" width="10" height="10" fill="{color}"/>')
+        parts.append(f'<text x="{legend_x + 14}" y="{height - 5}">{page_name}</text>')
+        legend_x += 90
+    parts.append("</svg>")
+
+    with open(path, "w") as f:
+        f.write("\n".join(parts))
+    return path
+
+def _log10(value):
+    return math.log10(max(value, 1))
+
+def main():
+    """Run the large-dataset benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=sorted(PAGES))
+    parser.add_argument("--sizes", nargs="+", type=int, help="Override the dataset sizes for every page")
+    args = parser.parse_args()
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    print("\n" + "="*60)
+    print("POOLAPP LARGE-DATASET RENDERING BENCHMARK")
+    print(f"Testing: {args.base_url}")
+    print(f"Started: {datetime.now().isoformat()}")
+    print("="*60 + "\n")
+
+    results = []
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        for name in args.pages:
+            config = PAGES[name]
+            for size in args.sizes or config["sizes"]:
+                print(f"Benchmarking {config['path']} with {size} rows...")
+                result = benchmark_size(browser, args.base_url, name, config, size)
+                result["needs_virtualization"] = needs_virtualization(result)
+                results.append(result)
+        browser.close()
+
+    print("\n" + "="*60)
+    print("BENCHMARK RESULTS")
+    print("="*60)
+    print(f"{'page':<10} {'size':>6} {'ttfr ms':>8} {'fps':>6} {'search':>7} {'filter':>7} {'nodes':>7}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['page']:<10} {r['size']:>6} ERROR: {r['error']}")
+            continue
+        print(
+            f"{r['page']:<10} {r['size']:>6} {r['time_to_first_row_ms'] or 0:>8.0f} "
+            f"{r['scroll']['fps']:>6.1f} {r['search_ms'] or 0:>7.1f} {r['filter_ms'] or 0:>7.1f} "
+            f"{r['dom_nodes']:>7}"
+        )
+    print("="*60)
+
+    for name in args.pages:
+        over = [r for r in results if r["page"] == name and r["needs_virtualization"]]
+        if over:
+            first = min(over, key=lambda r: r["size"])
+            print(f"{PAGES[name]['path']}: virtualize from ~{first['size']} rows ({', '.join(first['needs_virtualization'])})")
+        else:
+            print(f"{PAGES[name]['path']}: within budget at every size tested")
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    report_path = os.path.join(OUTPUT_DIR, f"large_datasets_{stamp}.json")
+    with open(report_path, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "base_url": args.base_url,
+            "budgets": {
+                "time_to_first_row_ms": TTFR_BUDGET_MS,
+                "min_scroll_fps": MIN_SCROLL_FPS,
+                "interaction_ms": INTERACTION_BUDGET_MS,
+                "dom_nodes": DOM_NODE_BUDGET,
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults saved to {report_path}")
+
+    measured = [r for r in results if "error" not in r]
+    if measured:
+        chart_path = render_chart(measured, os.path.join(OUTPUT_DIR, f"large_datasets_{stamp}.svg"))
+        print(f"Scaling chart saved to {chart_path}")
+    return results
+
+if __name__ == "__main__":
+    main()
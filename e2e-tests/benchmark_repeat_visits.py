@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+PoolApp Repeat-Visit Benchmark
+Replays pages the way dispatch staff use them - many times a day - using a
+persistent browser profile, in three states:
+
+  cold        fresh profile, nothing cached
+  warm-http   browser restarted on the same profile, so the disk HTTP cache
+              is warm but nothing is in memory
+  warm-nav    client-side navigation from another dashboard page via the
+              sidebar link, with the app shell already loaded
+
+Reports load time and transferred bytes for each state, the deltas against
+cold, and whether /_next/static chunks are actually served from cache.
+cold and warm-http load time is loadEventEnd; warm-nav has no load event,
+so it reports nav_to_paint_ms (click to second painted frame) instead and
+only its transfer size is compared with cold.
+"""
+
+from playwright.sync_api import sync_playwright
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from statistics import median
+from urllib.parse import urlparse
+
+BASE_URL = "https://poolapp-tau.vercel.app"
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+RUNS = 3
+STATES = ["cold", "warm-http", "warm-nav"]
+
+# page: page the warm-nav state navigates from (both are in the sidebar)
+PAGES = {
+    "/dashboard": "/customers",
+    "/routes": "/dashboard",
+}
+
+STATIC_PREFIX = "/_next/static/"
+
+# Resource timings of everything fetched since `since` (ms on the page clock)
+TIMING_SCRIPT = """
+(since) => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  const entries = performance.getEntriesByType('resource')
+    .filter((e) => e.startTime >= since)
+    .map((e) => ({
+      url: e.name,
+      transfer_size: e.transferSize,
+      encoded_size: e.encodedBodySize,
+      decoded_size: e.decodedBodySize,
+    }));
+  if (nav && since === 0) {
+    entries.unshift({
+      url: nav.name,
+      transfer_size: nav.transferSize,
+      encoded_size: nav.encodedBodySize,
+      decoded_size: nav.decodedBodySize,
+    });
+  }
+  return { entries, load_ms: nav ? nav.loadEventEnd : null };
+}
+"""
+
+# Resolves once the next two frames have been painted
+PAINTED_SCRIPT = """
+() => new Promise((resolve) =>
+  requestAnimationFrame(() => requestAnimationFrame(() => resolve(performance.now())))
+)
+"""
+
+def cache_status(entry):
+    """How a resource was served: cache, revalidated (304) or downloaded"""
+    if entry["transfer_size"] == 0 and entry["decoded_size"] > 0:
+        return "cache"
+    if entry["encoded_size"] and 0 < entry["transfer_size"] < entry["encoded_size"]:
+        return "revalidated"
+    return "downloaded"
+
+def measure(entries, timing, base_url):
+    """Timing ({metric: ms}), transfer size and static chunk cache breakdown"""
+    origin = urlparse(base_url).netloc
+    static = [
+        e for e in entries
+        if urlparse(e["url"]).netloc == origin and urlparse(e["url"]).path.startswith(STATIC_PREFIX)
+    ]
+    statuses = {"cache": 0, "revalidated": 0, "downloaded": 0}
+    for entry in static:
+        statuses[cache_status(entry)] += 1
+    return {
+        **{key: round(ms, 1) if ms is not None else None for key, ms in timing.items()},
+        "transfer_kb": round(sum(e["transfer_size"] or 0 for e in entries) / 1024, 1),
+        "requests": len(entries),
+        "static_chunks": len(static),
+        "static_from_cache": statuses["cache"],
+        "static_revalidated": statuses["revalidated"],
+        "static_downloaded": statuses["downloaded"],
+        "downloaded_chunks": [e["url"] for e in static if cache_status(e) == "downloaded"],
+    }
+
+def open_profile(p, user_data_dir):
+    """Launch Chromium on a persistent profile, recording static Cache-Control headers"""
+    context = p.chromium.launch_persistent_context(
+        user_data_dir, headless=True, viewport={"width": 1280, "height": 720}
+    )
+    headers = {}
+
+    def on_response(response):
+        if urlparse(response.url).path.startswith(STATIC_PREFIX):
+            headers[response.url] = response.headers.get("cache-control", "")
+
+    context.on("response", on_response)
+    page = context.pages[0] if context.pages else context.new_page()
+    return context, page, headers
+
+def full_load(page, base_url, path):
+    """Navigate by URL and measure the whole document load"""
+    page.goto(f"{base_url}{path}", wait_until="networkidle")
+    timing = page.evaluate(TIMING_SCRIPT, 0)
+    return measure(timing["entries"], {"load_ms": timing["load_ms"]}, base_url)
+
+def client_nav(page, base_url, path, via):
+    """Load `via`, then follow its sidebar link to `path` without a reload"""
+    page.goto(f"{base_url}{via}", wait_until="networkidle")
+    link = page.locator(f"nav[aria-label='Sidebar navigation'] a[href='{path}']").first
+    if link.count() == 0:
+        return None
+
+    start = page.evaluate("performance.now()")
+    link.click()
+    page.wait_for_url(f"**{path}")
+    painted = page.evaluate(PAINTED_SCRIPT)
+    page.wait_for_load_state("networkidle")
+    timing = page.evaluate(TIMING_SCRIPT, start)
+    return measure(timing["entries"], {"nav_to_paint_ms": painted - start}, base_url)
+
+def run_page(p, base_url, path, via):
+    """One cold -> warm-http -> warm-nav sequence on a throwaway profile"""
+    user_data_dir = tempfile.mkdtemp(prefix="poolapp-profile-")
+    try:
+        context, page, headers = open_profile(p, user_data_dir)
+        cold = full_load(page, base_url, path)
+        # Visit the page we navigate from too, so warm-nav starts from a cached shell
+        page.goto(f"{base_url}{via}", wait_until="networkidle")
+        cache_control = dict(headers)
+        context.close()
+
+        # Restart on the same profile: memory cache gone, disk cache kept
+        context, page, _ = open_profile(p, user_data_dir)
+        warm_http = full_load(page, base_url, path)
+        warm_nav = client_nav(page, base_url, path, via)
+        context.close()
+    finally:
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+    immutable = sum(1 for value in cache_control.values() if "immutable" in value)
+    return {
+        "cold": cold,
+        "warm-http": warm_http,
+        "warm-nav": warm_nav,
+        "static_cache_control": {"responses": len(cache_control), "immutable": immutable},
+    }
+
+def summarize(runs):
+    """Median of each numeric field per state across runs"""
+    summary = {}
+    for state in STATES:
+        samples = [r[state] for r in runs if r[state]]
+        if not samples:
+            summary[state] = None
+            continue
+        summary[state] = {}
+        for key in samples[0]:
+            if isinstance(samples[0][key], list):
+                continue
+            values = [s[key] for s in samples if s[key] is not None]
+            summary[state][key] = median(values) if values else None
+        summary[state]["downloaded_chunks"] = sorted({u for s in samples for u in s["downloaded_chunks"]})
+    return summary
+
+def deltas(summary):
+    """Each warm state against cold"""
+    cold = summary["cold"]
+    result = {}
+    for state in STATES[1:]:
+        if not summary[state]:
+            continue
+        result[state] = {}
+        for key in ("load_ms", "transfer_kb"):
+            # Only like-for-like metrics: warm-nav has no load_ms
+            if summary[state].get(key) is None or cold[key] is None:
+                continue
+            delta = summary[state][key] - cold[key]
+            result[state][key] = round(delta, 1)
+            result[state][f"{key}_pct"] = round(100 * delta / cold[key], 1) if cold[key] else None
+    return result
+
+def chunks_cached(summary):
+    """Static chunks are cached if the warm-http reload downloaded none of them"""
+    warm = summary["warm-http"]
+    return bool(warm) and warm["static_chunks"] > 0 and not warm["downloaded_chunks"]
+
+def main():
+    """Measure cold and warm visits for each page"""
+    parser = argparse.ArgumentParser(description="Compare cold and warm repeat visits")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=list(PAGES))
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("POOLAPP REPEAT-VISIT BENCHMARK")
+    print(f"Testing: {args.base_url}")
+    print(f"Started: {datetime.now().isoformat()}")
+    print("="*60 + "\n")
+
+    results = {}
+    with sync_playwright() as p:
+        for path in args.pages:
+            runs = []
+            for run in range(args.runs):
+                print(f"{path}: run {run + 1}/{args.runs}...")
+                runs.append(run_page(p, args.base_url, path, PAGES[path]))
+            summary = summarize(runs)
+            results[path] = {
+                "states": summary,
+                "deltas_vs_cold": deltas(summary),
+                "static_chunks_cached": chunks_cached(summary),
+                "static_cache_control": runs[-1]["static_cache_control"],
+            }
+
+    print("\n" + "="*60)
+    print("REPEAT-VISIT RESULTS (medians)")
+    print("="*60)
+    for path, result in results.items():
+        print(path)
+        for state in STATES:
+            stats = result["states"][state]
+            if not stats:
+                print(f"  {state:<10} not measured (no sidebar link from {PAGES[path]})")
+                continue
+            delta = result["deltas_vs_cold"].get(state, {})
+            changes = [f"{delta['load_ms']:+.0f}ms"] if "load_ms" in delta else []
+            changes += [f"{delta['transfer_kb']:+.1f}KB"] if "transfer_kb" in delta else []
+            suffix = f"  ({', '.join(changes)})" if changes else ""
+            timing = (
+                f"{stats['load_ms']:>8.0f}ms load" if stats.get("load_ms") is not None
+                else f"{stats['nav_to_paint_ms']:>8.0f}ms paint" if stats.get("nav_to_paint_ms") is not None
+                else f"{'-':>8}  load"
+            )
+            print(
+                f"  {state:<10} {timing} {stats['transfer_kb']:>9.1f}KB "
+                f"static {stats['static_from_cache']:.0f}/{stats['static_chunks']:.0f} cached{suffix}"
+            )
+        cache_control = result["static_cache_control"]
+        print(f"  immutable Cache-Control: {cache_control['immutable']}/{cache_control['responses']} static responses")
+        if result["static_chunks_cached"]:
+            print("  [OK] static chunks served from cache on repeat visit")
+        else:
+            print("  [WARN] static chunks re-downloaded on repeat visit:")
+            for url in (result["states"]["warm-http"] or {}).get("downloaded_chunks", [])[:10]:
+                print(f"    {url}")
+    print("="*60)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(OUTPUT_DIR, f"repeat_visits_{stamp}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "base_url": args.base_url,
+            "runs": args.runs,
+            "pages": results,
+        }, f, indent=2)
+    print(f"\nResults saved to {path}")
+    return results
+
+if __name__ == "__main__":
+    main()
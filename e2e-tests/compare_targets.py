@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+PoolApp Multi-Target Comparison
+Runs the E2E use cases against several deployments (e.g. production and a
+preview) concurrently from one shared browser pool, repeats each run, and
+compares pass status and page timings side by side with bootstrap
+confidence intervals on the deltas.
+
+A candidate is only promotable when every page timing is shown to be no
+worse than the baseline: the upper end of each delta's confidence interval
+must stay within PRACTICAL_DELTA of the baseline median. Too few samples,
+an interval too wide to decide, or a failed run all block promotion.
+
+Usage:
+    python compare_targets.py --target production=https://poolapp-tau.vercel.app \\
+        --target preview=https://poolapp-git-feature.vercel.app --samples 5
+"""
+
+from playwright.sync_api import sync_playwright
+import argparse
+import json
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime
+from statistics import median
+
+import determinism
+import test_all_use_cases as use_cases
+import waterfall
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "comparisons")
+
+METRICS = ["ttfb_ms", "fcp_ms", "dom_content_loaded_ms", "load_ms", "transfer_kb"]
+STATUS_RANK = {"PASS": 2, "PARTIAL": 1, "FAIL": 0}
+
+BOOTSTRAP_ITERATIONS = 2000
+CONFIDENCE = 0.95
+MIN_SAMPLES = 3
+# Non-inferiority margin: a candidate may be at most this share of the baseline slower
+PRACTICAL_DELTA = 0.02
+
+def parse_targets(values):
+    """Turn ['name=url', ...] into an ordered {name: url}; the first is the baseline"""
+    targets = {}
+    for value in values or [f"production={use_cases.BASE_URL}"]:
+        if "=" not in value:
+            raise SystemExit(f"Invalid --target '{value}', expected name=url")
+        name, url = value.split("=", 1)
+        targets[name] = url.rstrip("/")
+    return targets
+
+def run_job(browser, target, base_url, sample):
+    """Run every use case once against one target in a fresh context"""
+    run_dir = os.path.join(OUTPUT_DIR, "screenshots", target, f"sample{sample}")
+    records = []
+    use_cases.start_run(run_dir, records)
+
+    context = determinism.apply(browser.new_context(viewport={"width": 1280, "height": 720}))
+    page = context.new_page()
+    try:
+        statuses = use_cases.run_use_cases(page, browser, base_url)
+    finally:
+        context.close()
+
+    return {"target": target, "sample": sample, "statuses": statuses, "use_cases": records}
+
+def worker(jobs, outcomes):
+    """One browser in the pool; pulls jobs for any target until the queue is empty"""
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        while True:
+            try:
+                job = jobs.get_nowait()
+            except queue.Empty:
+                break
+            target, base_url, sample = job
+            print(f"[{threading.current_thread().name}] {target} sample {sample}: {base_url}")
+            try:
+                outcomes.append(run_job(browser, target, base_url, sample))
+            except Exception as e:
+                outcomes.append({"target": target, "sample": sample, "error": str(e), "statuses": [], "use_cases": []})
+        browser.close()
+
+def bootstrap_delta(baseline, candidate, rng):
+    """Median delta (candidate - baseline) with a bootstrap confidence interval"""
+    deltas = []
+    for _ in range(BOOTSTRAP_ITERATIONS):
+        a = [rng.choice(baseline) for _ in baseline]
+        b = [rng.choice(candidate) for _ in candidate]
+        deltas.append(median(b) - median(a))
+    deltas.sort()
+    tail = (1 - CONFIDENCE) / 2
+    low = deltas[int(tail * len(deltas))]
+    high = deltas[min(int((1 - tail) * len(deltas)), len(deltas) - 1)]
+    return median(candidate) - median(baseline), low, high
+
+def compare_metric(baseline, candidate, rng):
+    """Compare two sample sets of one metric; lower is better for every metric
+
+    ok is True only when the candidate is shown to be no worse than the
+    baseline, i.e. the whole confidence interval sits below the margin.
+    """
+    if len(baseline) < MIN_SAMPLES or len(candidate) < MIN_SAMPLES:
+        return {
+            "verdict": "insufficient samples",
+            "ok": False,
+            "baseline_n": len(baseline),
+            "candidate_n": len(candidate),
+        }
+
+    delta, low, high = bootstrap_delta(baseline, candidate, rng)
+    base = median(baseline)
+    floor = abs(base) * PRACTICAL_DELTA
+    if low > floor:
+        verdict = "slower"
+    elif high < -floor:
+        verdict = "faster"
+    elif high <= floor:
+        verdict = "not slower"
+    else:
+        verdict = "inconclusive"
+
+    return {
+        "baseline_median": round(base, 1),
+        "candidate_median": round(median(candidate), 1),
+        "delta": round(delta, 1),
+        "delta_pct": round(100 * delta / base, 1) if base else None,
+        "ci": [round(low, 1), round(high, 1)],
+        "baseline_n": len(baseline),
+        "candidate_n": len(candidate),
+        "verdict": verdict,
+        "ok": high <= floor,
+    }
+
+def page_samples(targets):
+    """Group captured navigations as {target: {"path @viewport": {metric: [values]}}}
+
+    Only the first visit of a path in each page is kept, and each viewport
+    gets its own sample set, so every set holds like-for-like cold loads.
+    """
+    samples = {name: {} for name in targets}
+    # Longest prefix first so e.g. https://a.app does not swallow https://a.app.preview
+    ordered = sorted(targets.items(), key=lambda t: -len(t[1]))
+    for navigation in waterfall.navigations:
+        if navigation["visit"] > 1:
+            continue
+        key = f"{navigation['path']} @{navigation['viewport']}"
+        for name, url in ordered:
+            if navigation["url"].startswith(url):
+                metrics = samples[name].setdefault(key, {m: [] for m in METRICS})
+                for metric in METRICS:
+                    if navigation.get(metric) is not None:
+                        metrics[metric].append(navigation[metric])
+                break
+    return samples
+
+def status_table(targets, outcomes):
+    """Per use case status counts for each target, e.g. {'PASS': 4, 'PARTIAL': 1}"""
+    table = {}
+    for outcome in outcomes:
+        for record in outcome["use_cases"]:
+            key = f"{record['use_case']}: {record['name']}"
+            counts = table.setdefault(key, {name: {} for name in targets})[outcome["target"]]
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+    return table
+
+def mean_rank(counts):
+    total = sum(counts.values())
+    return sum(STATUS_RANK[s] * n for s, n in counts.items()) / total if total else 0
+
+def build_comparison(targets, outcomes, seed=0):
+    """Side-by-side pass status and page timing deltas against the first target"""
+    rng = random.Random(seed)
+    names = list(targets)
+    baseline = names[0]
+    samples = page_samples(targets)
+    statuses = status_table(targets, outcomes)
+
+    errors = [o for o in outcomes if "error" in o]
+    comparisons = {}
+    for candidate in names[1:]:
+        pages = {}
+        for path in sorted(set(samples[baseline]) | set(samples[candidate])):
+            base_metrics = samples[baseline].get(path, {})
+            cand_metrics = samples[candidate].get(path, {})
+            pages[path] = {
+                metric: compare_metric(base_metrics.get(metric, []), cand_metrics.get(metric, []), rng)
+                for metric in METRICS
+            }
+        slower = [
+            f"{path} {metric}"
+            for path, metrics in pages.items()
+            for metric, result in metrics.items() if result["verdict"] == "slower"
+        ]
+        unproven = [
+            f"{path} {metric} ({result['verdict']})"
+            for path, metrics in pages.items()
+            for metric, result in metrics.items() if not result["ok"] and result["verdict"] != "slower"
+        ]
+        regressed = [
+            case for case, counts in statuses.items()
+            if mean_rank(counts[candidate]) < mean_rank(counts[baseline])
+        ]
+        failed_runs = [
+            f"{o['target']} sample {o['sample']}: {o['error']}"
+            for o in errors if o["target"] in (baseline, candidate)
+        ]
+        comparisons[candidate] = {
+            "pages": pages,
+            "slower": slower,
+            "unproven": unproven,
+            "status_regressions": regressed,
+            "failed_runs": failed_runs,
+            "promotable": bool(pages) and not (slower or unproven or regressed or failed_runs),
+        }
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "targets": targets,
+        "baseline": baseline,
+        "samples": max((o["sample"] for o in outcomes), default=-1) + 1,
+        "confidence": CONFIDENCE,
+        "errors": errors,
+        "statuses": statuses,
+        "comparisons": comparisons,
+    }
+
+def print_comparison(report):
+    """Side-by-side summary"""
+    names = list(report["targets"])
+    baseline = report["baseline"]
+
+    print("\n" + "="*60)
+    print("USE CASE STATUS")
+    print("="*60)
+    print(f"{'use case':<36}" + "".join(f"{name[:14]:>16}" for name in names))
+    for case, counts in report["statuses"].items():
+        cells = []
+        for name in names:
+            total = sum(counts[name].values())
+            cells.append(f"{counts[name].get('PASS', 0)}/{total} PASS")
+        print(f"{case[:36]:<36}" + "".join(f"{cell:>16}" for cell in cells))
+
+    for candidate, comparison in report["comparisons"].items():
+        print("\n" + "="*60)
+        print(f"{candidate.upper()} vs {baseline.upper()} (median, {int(report['confidence'] * 100)}% CI)")
+        print("="*60)
+        for path, metrics in comparison["pages"].items():
+            print(path)
+            for metric, result in metrics.items():
+                if "delta" not in result:
+                    print(f"  {metric:<22} {result['verdict']}")
+                    continue
+                print(
+                    f"  {metric:<22} {result['baseline_median']:>9} -> {result['candidate_median']:>9} "
+                    f"({result['delta']:+.1f}, CI {result['ci'][0]:+.1f}..{result['ci'][1]:+.1f}) {result['verdict']}"
+                )
+        verdict = "OK TO PROMOTE" if comparison["promotable"] else "NOT OK TO PROMOTE"
+        print(f"\n{candidate}: {verdict}")
+        for item in comparison["slower"]:
+            print(f"  slower: {item}")
+        for item in comparison["unproven"]:
+            print(f"  not shown to be no slower: {item}")
+        for item in comparison["status_regressions"]:
+            print(f"  status regression: {item}")
+        for item in comparison["failed_runs"]:
+            print(f"  failed run: {item}")
+        if not comparison["pages"]:
+            print("  no page timings captured")
+    print("="*60 + "\n")
+
+def main():
+    """Run the use cases against every target and compare them"""
+    parser = argparse.ArgumentParser(description="Compare deployments side by side")
+    parser.add_argument("--target", action="append", help="name=url, repeatable; the first is the baseline")
+    parser.add_argument("--samples", type=int, default=5, help="Runs per target")
+    parser.add_argument("--workers", type=int, default=4, help="Browsers in the shared pool")
+    parser.add_argument("--deterministic", action="store_true", help="Freeze clock, animations and random seeds")
+    args = parser.parse_args()
+    determinism.enable(args.deterministic)
+
+    targets = parse_targets(args.target)
+    if len(targets) < 2:
+        raise SystemExit("Need at least two targets to compare")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    print("\n" + "="*60)
+    print("POOLAPP MULTI-TARGET COMPARISON")
+    for name, url in targets.items():
+        print(f"{name}: {url}")
+    print(f"Samples: {args.samples}, browsers: {args.workers}")
+    print("="*60 + "\n")
+
+    # Interleave targets so both see the same network conditions over time
+    jobs = queue.Queue()
+    for sample in range(args.samples):
+        for name, url in targets.items():
+            jobs.put((name, url, sample))
+
+    outcomes = []
+    threads = [
+        threading.Thread(target=worker, args=(jobs, outcomes), name=f"browser-{i + 1}")
+        for i in range(max(1, min(args.workers, jobs.qsize())))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = build_comparison(targets, outcomes)
+    print_comparison(report)
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(OUTPUT_DIR, f"compare_{stamp}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Comparison saved to {path}")
+
+    return 0 if all(c["promotable"] for c in report["comparisons"].values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+PoolApp Deterministic Capture Mode
+Makes pages render the same way on every run so screenshots are
+reproducible byte for byte:
+
+  - a virtual clock installed at context creation and paused, so Date,
+    timers and requestAnimationFrame only move when settle() advances them
+  - CSS animations and transitions disabled
+  - Math.random replaced by a seeded generator
+
+settle() replaces fixed wall-clock sleeps. With the mode on it first waits
+for navigations and network requests to finish (those still take real
+time), then advances the virtual clock, firing due timers and animation
+frames immediately. With it off it falls back to page.wait_for_timeout(),
+so callers can use it unconditionally.
+"""
+
+from datetime import datetime, timedelta
+
+# Weekday morning, when dispatch has a full schedule to show
+FROZEN_TIME = datetime(2026, 3, 10, 8, 0, 0)
+SEED = 1337
+
+# settle() waits for this long without requests in flight, up to the timeout
+NETWORK_QUIET_MS = 500
+NETWORK_TIMEOUT_MS = 15000
+POLL_MS = 50
+
+# Adopted stylesheet rather than a <style> element, so React hydration never sees it
+FREEZE_SCRIPT = """
+((seed) => {
+  let state = seed >>> 0;
+  Math.random = () => {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+
+  const sheet = new CSSStyleSheet();
+  sheet.replaceSync(`
+    *, *::before, *::after {
+      animation-duration: 0s !important;
+      animation-delay: 0s !important;
+      animation-iteration-count: 1 !important;
+      transition-duration: 0s !important;
+      transition-delay: 0s !important;
+      scroll-behavior: auto !important;
+      caret-color: transparent !important;
+    }
+  `);
+  document.adoptedStyleSheets = [...document.adoptedStyleSheets, sheet];
+})(%d);
+"""
+
+enabled = False
+# Frozen contexts and the requests each has in flight
+_inflight = {}
+
+def enable(on=True):
+    """Turn deterministic mode on for every context passed to apply() from now on"""
+    global enabled
+    enabled = on
+
+def apply(context):
+    """Install the virtual clock, animation freeze and seeded random on a new context"""
+    if not enabled:
+        return context
+    context.add_init_script(FREEZE_SCRIPT % SEED)
+    context.clock.install(time=FROZEN_TIME)
+    # Pausing stops time flowing with the wall clock; only settle() moves it
+    context.clock.pause_at(FROZEN_TIME + timedelta(seconds=1))
+
+    pending = _inflight[context] = set()
+    context.on("request", pending.add)
+    context.on("requestfinished", pending.discard)
+    context.on("requestfailed", pending.discard)
+    context.on("close", lambda closed: _inflight.pop(closed, None))
+    return context
+
+def is_frozen(page):
+    return page.context in _inflight
+
+def wait_for_network(page):
+    """Wait in real time until the page's context has had no requests in flight for a while"""
+    pending = _inflight[page.context]
+    quiet = waited = 0
+    while quiet < NETWORK_QUIET_MS and waited < NETWORK_TIMEOUT_MS:
+        # Polling through Playwright also delivers the request events
+        page.wait_for_timeout(POLL_MS)
+        waited += POLL_MS
+        quiet = 0 if pending else quiet + POLL_MS
+
+def settle(page, ms=500):
+    """Let timers, counters and animations run for ms, virtually when frozen
+
+    When frozen, navigations and fetches started by a preceding click or goto
+    finish first, so captures never race them; so do any the timers start.
+    """
+    if not is_frozen(page):
+        page.wait_for_timeout(ms)
+        return
+    page.wait_for_load_state("load")
+    wait_for_network(page)
+    page.clock.run_for(ms)
+    wait_for_network(page)
@@ -1,14 +1,75 @@
 #!/usr/bin/env python3
 """
 Final QA verification - confirms all critical paths work
+
+Run once (default) or as a synthetic-monitoring daemon:
+    python final_qa_check.py --daemon --interval 60 --metrics-port 9464
+The daemon re-runs the check table on a jittered schedule and exposes
+per-route latency histograms and availability at /metrics (Prometheus text
+format) and as JSONL.
 """
 
 from playwright.sync_api import sync_playwright
+import argparse
+import bisect
+import json
+import os
+import queue
+import random
 import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 BASE_URL = "https://poolapp-tau.vercel.app"
 
-def final_qa():
+# (name, progress label, path, predicate(title, content))
+CHECKS = [
+    ("Homepage loads", "homepage", "",
+     lambda title, content: "Pool" in title or "pool" in content.lower()),
+    ("Convention page loads", "convention page", "/convention",
+     lambda title, content: "$79" in content or "convention" in content.lower()),
+    ("Dashboard loads", "dashboard", "/dashboard",
+     lambda title, content: "revenue" in content.lower() or "$" in content),
+    ("Routes page loads", "routes page", "/routes",
+     lambda title, content: "route" in content.lower() or "optimi" in content.lower()),
+    ("Customers page loads", "customers page", "/customers",
+     lambda title, content: "customer" in content.lower() or "chemistry" in content.lower()),
+    ("Invoices page loads", "invoices page", "/invoices",
+     lambda title, content: "invoice" in content.lower() or "paid" in content.lower()),
+    ("QR page loads", "QR page", "/qr",
+     lambda title, content: "scan" in content.lower() or "qr" in content.lower()),
+    ("Login page loads", "login page", "/login",
+     lambda title, content: "login" in content.lower() or "sign in" in content.lower() or "email" in content.lower()),
+]
+
+# Daemon defaults
+DEFAULT_INTERVAL = 60
+JITTER = 0.2
+MAX_BACKOFF = 15 * 60
+# A cycle with at least this share of failed checks backs off the schedule
+BACKOFF_FAILURE_RATIO = 0.5
+CHECK_TIMEOUT_MS = 30000
+ROLLING_WINDOW = 15 * 60
+LATENCY_BUCKETS = [0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 30]
+# Extra seconds a cycle waits for results beyond the check timeouts
+RESULT_GRACE = 30
+# Pause before a worker relaunches Playwright after it failed outright
+RESTART_DELAY = 5
+JSONL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "final_qa_probe.jsonl")
+
+def run_check(page, base_url, check):
+    """Load one check's page and return (status, seconds)"""
+    name, label, path, predicate = check
+    start = time.monotonic()
+    page.goto(f"{base_url}{path}", wait_until="networkidle", timeout=CHECK_TIMEOUT_MS)
+    elapsed = time.monotonic() - start
+    status = "PASS" if predicate(page.title(), page.content()) else "FAIL"
+    return status, elapsed
+
+def final_qa(base_url=BASE_URL):
     """Run final QA verification"""
     print("\n" + "="*60)
     print("FINAL QA VERIFICATION - POOLAPP")
@@ -22,85 +83,14 @@ def final_qa():
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
 
-        # Test 1: Homepage loads
-        print("Checking homepage...")
-        page.goto(BASE_URL, wait_until="networkidle")
-        if "Pool" in page.title() or "pool" in page.content().lower():
-            results.append(("Homepage loads", "PASS"))
-            passed += 1
-        else:
-            results.append(("Homepage loads", "FAIL"))
-            failed += 1
-
-        # Test 2: Convention page loads
-        print("Checking convention page...")
-        page.goto(f"{BASE_URL}/convention", wait_until="networkidle")
-        if "$79" in page.content() or "convention" in page.content().lower():
-            results.append(("Convention page loads", "PASS"))
-            passed += 1
-        else:
-            results.append(("Convention page loads", "FAIL"))
-            failed += 1
-
-        # Test 3: Dashboard loads
-        print("Checking dashboard...")
-        page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
-        if "revenue" in page.content().lower() or "$" in page.content():
-            results.append(("Dashboard loads", "PASS"))
-            passed += 1
-        else:
-            results.append(("Dashboard loads", "FAIL"))
-            failed += 1
-
-        # Test 4: Routes page loads
-        print("Checking routes page...")
-        page.goto(f"{BASE_URL}/routes", wait_until="networkidle")
-        if "route" in page.content().lower() or "optimi" in page.content().lower():
-            results.append(("Routes page loads", "PASS"))
-            passed += 1
-        else:
-            results.append(("Routes page loads", "FAIL"))
-            failed += 1
-
-        # Test 5: Customers page loads
-        print("Checking customers page...")
-        page.goto(f"{BASE_URL}/customers", wait_until="networkidle")
-        if "customer" in page.content().lower() or "chemistry" in page.content().lower():
-            results.append(("Customers page loads", "PASS"))
-            passed += 1
-        else:
-            results.append(("Customers page loads", "FAIL"))
-            failed += 1
-
-        # Test 6: Invoices page loads
-        print("Checking invoices page...")
-        page.goto(f"{BASE_URL}/invoices", wait_until="networkidle")
-        if "invoice" in page.content().lower() or "paid" in page.content().lower():
-            results.append(("Invoices page loads", "PASS"))
-            passed += 1
-        else:
-            results.append(("Invoices page loads", "FAIL"))
-            failed += 1
-
-        # Test 7: QR page loads
-        print("Checking QR page...")
-        page.goto(f"{BASE_URL}/qr", wait_until="networkidle")
-        if "scan" in page.content().lower() or "qr" in page.content().lower():
-            results.append(("QR page loads", "PASS"))
-            passed += 1
-        else:
-            results.append(("QR page loads", "FAIL"))
-            failed += 1
-
-        # Test 8: Login page loads
-        print("Checking login page...")
-        page.goto(f"{BASE_URL}/login", wait_until="networkidle")
-        if "login" in page.content().lower() or "sign in" in page.content().lower() or "email" in page.content().lower():
-            results.append(("Login page loads", "PASS"))
-            passed += 1
-        else:
-            results.append(("Login page loads", "FAIL"))
-            failed += 1
+        for check in CHECKS:
+            print(f"Checking {check[1]}...")
+            status, _ = run_check(page, base_url, check)
+            results.append((check[0], status))
+            if status == "PASS":
+                passed += 1
+            else:
+                failed += 1
 
         browser.close()
 
@@ -122,5 +112,259 @@ def final_qa():
         print(f"WARNING: {failed} checks failed!")
         return 1
 
+class ProbeMetrics:
+    """Per-route latency histograms and availability, shared with the metrics endpoint"""
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.recent = {}
+        self.cycles = 0
+        self.backoff_seconds = 0
+
+    def observe(self, route, status, seconds):
+        now = time.time()
+        with self.lock:
+            histogram = self.histograms.setdefault(route, {
+                "buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0, "failures": 0,
+            })
+            if seconds is not None:
+                index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+                for i in range(index, len(LATENCY_BUCKETS)):
+                    histogram["buckets"][i] += 1
+                histogram["sum"] += seconds
+                histogram["count"] += 1
+            if status != "PASS":
+                histogram["failures"] += 1
+
+            recent = self.recent.setdefault(route, deque())
+            recent.append((now, status == "PASS", seconds))
+            while recent and recent[0][0] < now - self.window:
+                recent.popleft()
+
+    def rolling(self, route):
+        """Availability and latency quantiles over the rolling window"""
+        samples = list(self.recent.get(route, ()))
+        latencies = sorted(s for _, _, s in samples if s is not None)
+        stats = {
+            "availability": sum(1 for _, ok, _ in samples if ok) / len(samples) if samples else None,
+            "samples": len(samples),
+        }
+        for q in (0.5, 0.95, 0.99):
+            stats[f"p{int(q * 100)}"] = latencies[min(int(q * len(latencies)), len(latencies) - 1)] if latencies else None
+        return stats
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = [
+            "# HELP poolapp_probe_latency_seconds Page load time of each QA check.",
+            "# TYPE poolapp_probe_latency_seconds histogram",
+        ]
+        with self.lock:
+            for route, h in sorted(self.histograms.items()):
+                for bound, count in zip(LATENCY_BUCKETS, h["buckets"]):
+                    lines.append(f'poolapp_probe_latency_seconds_bucket{{route="{route}",le="{bound}"}} {count}')
+                lines.append(f'poolapp_probe_latency_seconds_bucket{{route="{route}",le="+Inf"}} {h["count"]}')
+                lines.append(f'poolapp_probe_latency_seconds_sum{{route="{route}"}} {h["sum"]:.6f}')
+                lines.append(f'poolapp_probe_latency_seconds_count{{route="{route}"}} {h["count"]}')
+
+            lines += [
+                "# HELP poolapp_probe_failures_total Failed QA checks.",
+                "# TYPE poolapp_probe_failures_total counter",
+            ]
+            for route, h in sorted(self.histograms.items()):
+                lines.append(f'poolapp_probe_failures_total{{route="{route}"}} {h["failures"]}')
+
+            rolling = {route: self.rolling(route) for route in sorted(self.recent)}
+            lines += [
+                f"# HELP poolapp_probe_availability_ratio Share of passing checks over the last {self.window}s.",
+                "# TYPE poolapp_probe_availability_ratio gauge",
+            ]
+            for route, stats in rolling.items():
+                if stats["availability"] is not None:
+                    lines.append(f'poolapp_probe_availability_ratio{{route="{route}"}} {stats["availability"]:.4f}')
+            lines += [
+                f"# HELP poolapp_probe_rolling_latency_seconds Latency quantiles over the last {self.window}s.",
+                "# TYPE poolapp_probe_rolling_latency_seconds gauge",
+            ]
+            for route, stats in rolling.items():
+                for q in ("p50", "p95", "p99"):
+                    if stats[q] is not None:
+                        quantile = int(q[1:]) / 100
+                        lines.append(f'poolapp_probe_rolling_latency_seconds{{route="{route}",quantile="{quantile}"}} {stats[q]:.6f}')
+
+            lines += [
+                "# TYPE poolapp_probe_cycles_total counter",
+                f"poolapp_probe_cycles_total {self.cycles}",
+                "# TYPE poolapp_probe_backoff_seconds gauge",
+                f"poolapp_probe_backoff_seconds {self.backoff_seconds}",
+            ]
+        return "\n".join(lines) + "\n"
+
+def serve_metrics(metrics, port):
+    """Expose /metrics on a background thread"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+def probe_worker(base_url, jobs, done, stop):
+    """One page in the capped pool; runs checks handed out by the scheduler
+
+    A failed check gets a fresh page for the next one, and a crashed or
+    disconnected browser is relaunched, so one failure does not fail every
+    later cycle.
+    """
+    name = threading.current_thread().name
+    while not stop.is_set():
+        try:
+            with sync_playwright() as p:
+                browser, page = None, None
+                while not stop.is_set():
+                    if browser is None or not browser.is_connected():
+                        browser, page = p.chromium.launch(headless=True), None
+                    if page is None or page.is_closed():
+                        page = browser.new_page()
+                    try:
+                        cycle, check = jobs.get(timeout=1)
+                    except queue.Empty:
+                        continue
+                    try:
+                        status, seconds = run_check(page, base_url, check)
+                        error = None
+                    except Exception as e:
+                        status, seconds, error = "FAIL", None, str(e)
+                        try:
+                            page.close()
+                        except Exception:
+                            pass
+                        page = None
+                    done.put((cycle, check, status, seconds, error))
+                if browser is not None and browser.is_connected():
+                    browser.close()
+        except Exception as e:
+            print(f"[{name}] browser failed, restarting: {e}")
+            stop.wait(RESTART_DELAY)
+
+def run_daemon(base_url, interval, max_pages, metrics_port, jsonl_path, cycles=None):
+    """Run the check table on a jittered schedule until interrupted"""
+    metrics = ProbeMetrics()
+    server = serve_metrics(metrics, metrics_port)
+    print(f"Monitoring {base_url} every ~{interval}s with up to {max_pages} pages")
+    print(f"Metrics: http://127.0.0.1:{metrics_port}/metrics")
+    print(f"JSONL: {jsonl_path}")
+
+    jobs, done, stop = queue.Queue(), queue.Queue(), threading.Event()
+    workers = [
+        threading.Thread(target=probe_worker, args=(base_url, jobs, done, stop), name=f"probe-{i + 1}", daemon=True)
+        for i in range(max_pages)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Every check times out on its own; allow for them queueing behind each other
+    cycle_timeout = CHECK_TIMEOUT_MS / 1000 * -(-len(CHECKS) // max_pages) + RESULT_GRACE
+
+    backoff = 0
+    try:
+        while cycles is None or metrics.cycles < cycles:
+            cycle = metrics.cycles
+            for check in CHECKS:
+                jobs.put((cycle, check))
+
+            results = {}
+            deadline = time.monotonic() + cycle_timeout
+            while len(results) < len(CHECKS):
+                try:
+                    result_cycle, check, status, seconds, error = done.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                # Late results from a cycle that already timed out
+                if result_cycle == cycle:
+                    results[check[0]] = (status, seconds, error)
+
+            # Checks no worker picked up or finished in time count as failures
+            while True:
+                try:
+                    jobs.get_nowait()
+                except queue.Empty:
+                    break
+            for check in CHECKS:
+                if check[0] not in results:
+                    results[check[0]] = ("FAIL", None, f"no result within {cycle_timeout:.0f}s")
+
+            failed = 0
+            with open(jsonl_path, "a") as f:
+                for check in CHECKS:
+                    status, seconds, error = results[check[0]]
+                    route = check[2] or "/"
+                    metrics.observe(route, status, seconds)
+                    failed += status != "PASS"
+                    record = {
+                        "timestamp": datetime.now().isoformat(),
+                        "check": check[0],
+                        "route": route,
+                        "status": status,
+                        "latency_s": round(seconds, 3) if seconds is not None else None,
+                    }
+                    if error:
+                        record["error"] = error
+                    f.write(json.dumps(record) + "\n")
+
+            # Back off while the site is struggling instead of adding load
+            if failed / len(CHECKS) >= BACKOFF_FAILURE_RATIO:
+                backoff = min(max(backoff * 2, interval), MAX_BACKOFF)
+            else:
+                backoff = 0
+            with metrics.lock:
+                metrics.cycles += 1
+                metrics.backoff_seconds = backoff
+
+            delay = (interval + backoff) * random.uniform(1 - JITTER, 1 + JITTER)
+            print(f"[{datetime.now().isoformat()}] cycle {metrics.cycles}: "
+                  f"{len(CHECKS) - failed}/{len(CHECKS)} passed, next in {delay:.0f}s")
+            if cycles is not None and metrics.cycles >= cycles:
+                break
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        print("\nStopping monitor...")
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=5)
+        server.shutdown()
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Final QA verification")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--daemon", action="store_true", help="Keep running the checks on a schedule")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between cycles")
+    parser.add_argument("--max-pages", type=int, default=2, help="Cap on concurrently open pages")
+    parser.add_argument("--metrics-port", type=int, default=9464)
+    parser.add_argument("--jsonl", default=JSONL_PATH)
+    parser.add_argument("--cycles", type=int, help="Stop after this many cycles")
+    args = parser.parse_args()
+
+    if args.daemon:
+        return run_daemon(args.base_url, args.interval, max(1, args.max_pages),
+                          args.metrics_port, args.jsonl, args.cycles)
+    return final_qa(args.base_url)
+
 if __name__ == "__main__":
-    sys.exit(final_qa())
+    sys.exit(main())
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+PoolApp API Load Test
+Open-model asyncio load generator for the server endpoints in app/api, with
+local stand-ins for Stripe and Supabase so it runs offline against `next start`.
+
+Usage:
+    # 1. Start the stand-ins and print the env the app must be built with
+    python load_test_api.py --stand-ins-only
+    # 2. In another shell, build and start the app with that env
+    env $(python load_test_api.py --print-env) sh -c "npm run build && npm start"
+    # 3. Run the load
+    python load_test_api.py --no-stand-ins --scenarios behavior-ingest --rate-scale 4 --profile ramp
+
+NEXT_PUBLIC_* variables are inlined by `next build`, so the app has to be
+built with the stand-in env, not just started with it.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+BASE_URL = "http://localhost:3000"
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_tests")
+
+STRIPE_STAND_IN_PORT = 12111
+SUPABASE_STAND_IN_PORT = 54321
+
+DEFAULT_DURATION = 60
+# Requests in flight beyond this are dropped (and counted) instead of queued
+MAX_IN_FLIGHT = 500
+REQUEST_TIMEOUT = 30
+# Rows the Supabase stand-in keeps per table to answer selects
+STAND_IN_ROW_LIMIT = 5000
+
+BEHAVIOR_EVENT_TYPES = ["scroll", "time", "mouse", "form", "click", "rage_click"]
+PAGES = ["/", "/convention", "/dashboard", "/routes", "/customers", "/invoices", "/qr"]
+
+def behavior_batch(rng):
+    """A flush from lib/analytics/behavior.ts (BATCH_SIZE = 10)"""
+    session = f"session_{rng.randrange(10**9)}"
+    now = int(time.time() * 1000)
+    events = []
+    for i in range(10):
+        event_type = rng.choice(BEHAVIOR_EVENT_TYPES)
+        data = {"maxDepth": rng.randint(0, 100)} if event_type == "scroll" else {"x": rng.randint(0, 1280), "y": rng.randint(0, 720)}
+        events.append({
+            "type": event_type,
+            "timestamp": now - (10 - i) * 500,
+            "page": rng.choice(PAGES),
+            "sessionId": session,
+            "data": data,
+        })
+    return {"events": events}
+
+def pageview(rng):
+    return {"type": "pageview", "data": {"path": rng.choice(PAGES), "sessionId": f"session_{rng.randrange(10**9)}"}}
+
+def checkout(rng):
+    return {
+        "priceId": "convention-special",
+        "email": f"load{rng.randrange(10**6)}@poolcompany.com",
+        "companyName": "Load Test Pool Co",
+        "plan": "convention-special",
+    }
+
+# name: (method, path, body factory, default requests/second)
+SCENARIOS = {
+    "behavior-ingest": ("POST", "/api/analytics/behavior", behavior_batch, 50),
+    "behavior-summary": ("GET", "/api/analytics/behavior?format=summary", None, 1),
+    "analytics-log": ("POST", "/api/analytics", pageview, 10),
+    "analytics-summary": ("GET", "/api/analytics?type=summary", None, 2),
+    "insights": ("GET", "/api/analytics/insights", None, 1),
+    "checkout": ("POST", "/api/create-checkout-session", checkout, 2),
+    "cron-analyze": ("POST", "/api/cron/analyze", lambda rng: {}, 0.2),
+    "test-db": ("GET", "/api/test-db", None, 0.5),
+}
+
+# Stages of (seconds as a share of --duration, start rate factor, end rate factor)
+PROFILES = {
+    "steady": [(1.0, 1.0, 1.0)],
+    "ramp": [(0.3, 0.0, 1.0), (0.7, 1.0, 1.0)],
+    "step": [(0.25, 0.25, 0.25), (0.25, 0.5, 0.5), (0.25, 0.75, 0.75), (0.25, 1.0, 1.0)],
+    "spike": [(0.4, 1.0, 1.0), (0.2, 5.0, 5.0), (0.4, 1.0, 1.0)],
+}
+
+# =============================================================================
+# Local stand-ins
+# =============================================================================
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def reply(self, status, payload=None, headers=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+class StripeStandIn(StandInHandler):
+    """Answers the Checkout Session call made by app/api/create-checkout-session"""
+
+    def do_POST(self):
+        self.read_body()
+        if self.path.startswith("/v1/checkout/sessions"):
+            session_id = f"cs_test_{uuid.uuid4().hex}"
+            self.reply(200, {
+                "id": session_id,
+                "object": "checkout.session",
+                "mode": "subscription",
+                "status": "open",
+                "url": f"http://127.0.0.1:{self.server.server_port}/pay/{session_id}",
+            })
+        else:
+            self.reply(404, {"error": {"type": "invalid_request_error", "message": f"No stand-in for {self.path}"}})
+
+class SupabaseStandIn(StandInHandler):
+    """Minimal PostgREST: inserts are kept in memory, selects return them, HEAD returns counts"""
+
+    tables = {}
+    lock = threading.Lock()
+
+    def table(self):
+        path = urlsplit(self.path).path
+        if not path.startswith("/rest/v1/"):
+            return None
+        return path[len("/rest/v1/"):].strip("/")
+
+    def do_POST(self):
+        table = self.table()
+        body = self.read_body()
+        if not table:
+            self.reply(404, {"message": "not found"})
+            return
+        rows = json.loads(body or b"[]")
+        rows = rows if isinstance(rows, list) else [rows]
+        with self.lock:
+            stored = self.tables.setdefault(table, [])
+            stored.extend(rows)
+            del stored[:-STAND_IN_ROW_LIMIT]
+        if "return=representation" in (self.headers.get("Prefer") or ""):
+            self.reply(201, rows)
+        else:
+            self.reply(201)
+
+    def do_GET(self):
+        table = self.table()
+        if not table:
+            self.reply(404, {"message": "not found"})
+            return
+        with self.lock:
+            rows = list(self.tables.get(table, []))
+        self.reply(200, rows, {"Content-Range": f"0-{max(len(rows) - 1, 0)}/{len(rows)}"})
+
+    def do_HEAD(self):
+        table = self.table()
+        with self.lock:
+            count = len(self.tables.get(table, []))
+        self.reply(200, headers={"Content-Range": f"*/{count}"})
+
+def start_stand_ins(latency_ms=0):
+    """Serve the Stripe and Supabase stand-ins on background threads"""
+    servers = []
+    for handler, port in ((StripeStandIn, STRIPE_STAND_IN_PORT), (SupabaseStandIn, SUPABASE_STAND_IN_PORT)):
+        handler.latency = latency_ms / 1000
+        server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+def stand_in_env():
+    """Environment the app must be built and started with to use the stand-ins"""
+    return {
+        "NEXT_PUBLIC_SUPABASE_URL": f"http://127.0.0.1:{SUPABASE_STAND_IN_PORT}",
+        "NEXT_PUBLIC_SUPABASE_ANON_KEY": "stand-in-anon-key",
+        "SUPABASE_SERVICE_ROLE_KEY": "stand-in-service-key",
+        "STRIPE_SECRET_KEY": "sk_test_stand_in",
+        "STRIPE_API_BASE": f"http://127.0.0.1:{STRIPE_STAND_IN_PORT}",
+    }
+
+# =============================================================================
+# HTTP client
+# =============================================================================
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to one origin"""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.host_header = parts.netloc
+        self.idle = []
+
+    async def request(self, method, path, body=None, headers=None):
+        """Return (status, body bytes); retries once if a reused connection was stale"""
+        for attempt in range(2):
+            reused = bool(self.idle)
+            conn = self.idle.pop() if reused else await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+            try:
+                status, response_headers, data = await self._roundtrip(conn, method, path, body, headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                conn[1].close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                conn[1].close()
+                raise
+            if response_headers.get("connection", "").lower() == "close":
+                conn[1].close()
+            else:
+                self.idle.append(conn)
+            return status, data
+
+    async def _roundtrip(self, conn, method, path, body, headers):
+        reader, writer = conn
+        payload = json.dumps(body).encode() if body is not None else b""
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host_header}",
+            "User-Agent: poolapp-load-test",
+            "Accept: application/json",
+            f"Content-Length: {len(payload)}",
+        ]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + payload)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, value = line.decode("latin-1").split(":", 1)
+            response_headers[key.strip().lower()] = value.strip()
+
+        if method == "HEAD" or status in (204, 304):
+            data = b""
+        elif "chunked" in response_headers.get("transfer-encoding", ""):
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b"".join(chunks)
+        elif "content-length" in response_headers:
+            data = await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            data = await reader.read()
+            response_headers["connection"] = "close"
+        return status, response_headers, data
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+# =============================================================================
+# Load generation
+# =============================================================================
+
+class ScenarioStats:
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self.dropped = 0
+        self.sent = 0
+
+    def record(self, status, seconds):
+        key = str(status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors += 1
+        if isinstance(status, int):
+            self.latencies.append(seconds)
+
+    def summary(self, duration):
+        latencies = sorted(self.latencies)
+
+        def quantile(q):
+            return round(latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000, 1) if latencies else None
+
+        completed = sum(self.statuses.values())
+        return {
+            "sent": self.sent,
+            "completed": completed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "error_rate": round(self.errors / completed, 4) if completed else None,
+            "throughput_rps": round(completed / duration, 2) if duration else None,
+            "p50_ms": quantile(0.50),
+            "p95_ms": quantile(0.95),
+            "p99_ms": quantile(0.99),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else None,
+            "statuses": self.statuses,
+        }
+
+def rate_at(profile, duration, elapsed):
+    """Rate factor of a ramp profile at `elapsed` seconds into the run"""
+    start = 0.0
+    for share, from_factor, to_factor in profile:
+        length = share * duration
+        if elapsed < start + length:
+            progress = (elapsed - start) / length if length else 1
+            return from_factor + (to_factor - from_factor) * progress
+        start += length
+    return profile[-1][2]
+
+async def fire(pool, scenario, stats, rng, headers, in_flight):
+    method, path, factory, _ = SCENARIOS[scenario]
+    body = factory(rng) if factory else None
+    start = time.perf_counter()
+    try:
+        status, _ = await asyncio.wait_for(pool.request(method, path, body, headers), REQUEST_TIMEOUT)
+    except asyncio.TimeoutError:
+        status = "timeout"
+    except Exception as e:
+        status = type(e).__name__
+    stats.record(status, time.perf_counter() - start)
+    in_flight.discard(asyncio.current_task())
+
+async def arrivals(pool, scenario, rate, profile, duration, stats, rng, headers, in_flight):
+    """Open model: Poisson arrivals following the profile, independent of completions.
+
+    Arrivals are drawn at the profile's peak rate and thinned to the current
+    rate, which keeps ramps exact even when the rate starts near zero.
+    """
+    peak = rate * max(max(stage[1], stage[2]) for stage in profile)
+    if peak <= 0:
+        return
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    while True:
+        await asyncio.sleep(rng.expovariate(peak))
+        elapsed = loop.time() - started
+        if elapsed >= duration:
+            return
+        if rng.random() * peak > rate * rate_at(profile, duration, elapsed):
+            continue
+        if len(in_flight) >= MAX_IN_FLIGHT:
+            stats.dropped += 1
+            continue
+        stats.sent += 1
+        task = asyncio.ensure_future(fire(pool, scenario, stats, rng, headers, in_flight))
+        in_flight.add(task)
+
+async def run_load(base_url, scenarios, rate_scale, profile_name, duration, headers, seed):
+    pool = ConnectionPool(base_url)
+    rng = random.Random(seed)
+    profile = PROFILES[profile_name]
+    in_flight = set()
+    stats = {name: ScenarioStats(name) for name in scenarios}
+
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        arrivals(pool, name, SCENARIOS[name][3] * rate_scale, profile, duration, stats[name],
+                 random.Random(rng.random()), headers, in_flight)
+        for name in scenarios
+    ])
+    if in_flight:
+        await asyncio.wait(set(in_flight), timeout=REQUEST_TIMEOUT)
+    elapsed = time.perf_counter() - started
+    pool.close()
+    return {name: s.summary(elapsed) for name, s in stats.items()}, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the app/api endpoints")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--rate-scale", type=float, default=1.0, help="Multiplier on each scenario's default rate")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="ramp")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds")
+    parser.add_argument("--cron-secret", help="Sent as x-vercel-cron-secret / x-api-key")
+    parser.add_argument("--stand-in-latency-ms", type=float, default=0, help="Added to every stand-in response")
+    parser.add_argument("--no-stand-ins", action="store_true", help="Stand-ins are already running elsewhere")
+    parser.add_argument("--stand-ins-only", action="store_true", help="Only run the stand-ins")
+    parser.add_argument("--print-env", action="store_true", help="Print the stand-in env for the app and exit")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.print_env:
+        print(" ".join(f"{k}={v}" for k, v in stand_in_env().items()))
+        return 0
+
+    servers = [] if args.no_stand_ins else start_stand_ins(args.stand_in_latency_ms)
+    if args.stand_ins_only:
+        print("Stand-ins running. Build and start the app with:")
+        for key, value in stand_in_env().items():
+            print(f"  {key}={value}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            return 0
+
+    headers = {}
+    if args.cron_secret:
+        headers = {"x-vercel-cron-secret": args.cron_secret, "x-api-key": args.cron_secret}
+
+    print("\n" + "="*60)
+    print("POOLAPP API LOAD TEST")
+    print(f"Testing: {args.base_url}")
+    print(f"Profile: {args.profile}, {args.duration:.0f}s, rate x{args.rate_scale}")
+    print(f"Started: {datetime.now().isoformat()}")
+    print("="*60 + "\n")
+
+    results, elapsed = asyncio.run(run_load(
+        args.base_url, args.scenarios, args.rate_scale, args.profile, args.duration, headers, args.seed,
+    ))
+    for server in servers:
+        server.shutdown()
+
+    print(f"{'scenario':<18} {'sent':>6} {'rps':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'err%':>6} {'drop':>5}")
+    for name, r in results.items():
+        error_pct = f"{r['error_rate'] * 100:.1f}" if r["error_rate"] is not None else "-"
+        print(
+            f"{name:<18} {r['sent']:>6} {r['throughput_rps'] or 0:>7.1f} {r['p50_ms'] or 0:>7.0f} "
+            f"{r['p95_ms'] or 0:>7.0f} {r['p99_ms'] or 0:>7.0f} {error_pct:>6} {r['dropped']:>5}"
+        )
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(OUTPUT_DIR, f"api_load_{stamp}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "base_url": args.base_url,
+            "profile": args.profile,
+            "duration_s": round(elapsed, 1),
+            "rate_scale": args.rate_scale,
+            "stand_ins": not args.no_stand_ins,
+            "scenarios": results,
+        }, f, indent=2)
+    print(f"\nResults saved to {path}")
+
+    return 1 if any(r["errors"] for r in results.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
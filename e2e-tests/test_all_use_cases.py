@@ -2,12 +2,21 @@
 """
 PoolApp E2E Test Suite - Convention Pre-Launch QA
 Tests all 8 use cases for pool service company owners
+
+Also writes a request waterfall report and flags routes whose JS grew
+against waterfall_baseline.json. The first run has nothing to compare
+against; record the baseline from a known-good run with --update-baseline.
 """
 
 from playwright.sync_api import sync_playwright
+import argparse
 import os
 import json
+import threading
 from datetime import datetime
+import auth_session
+import determinism
+import waterfall
 
 BASE_URL = "https://poolapp-tau.vercel.app"
 SCREENSHOT_DIR = "/Users/brandonbot/projects/workbench/poolapp/e2e-tests/screenshots"
@@ -21,9 +30,19 @@ results = {
     "use_cases": []
 }
 
+# Per-thread output overrides, so several runs can share the process (compare_targets.py)
+_run = threading.local()
+
+def start_run(screenshot_dir, use_cases):
+    """Send this thread's screenshots and use case results somewhere else"""
+    os.makedirs(screenshot_dir, exist_ok=True)
+    _run.screenshot_dir = screenshot_dir
+    _run.use_cases = use_cases
+
 def take_screenshot(page, name):
     """Take screenshot and return the path"""
-    path = f"{SCREENSHOT_DIR}/{name}.png"
+    screenshot_dir = getattr(_run, "screenshot_dir", SCREENSHOT_DIR)
+    path = f"{screenshot_dir}/{name}.png"
     page.screenshot(path=path, full_page=True)
     return path
 
@@ -37,7 +56,7 @@ def log_result(use_case_num, name, status, screenshots, notes, issues=None):
         "notes": notes,
         "issues": issues or []
     }
-    results["use_cases"].append(result)
+    getattr(_run, "use_cases", results["use_cases"]).append(result)
     print(f"\n{'='*60}")
     print(f"USE CASE {use_case_num}: {name}")
     print(f"STATUS: {status}")
@@ -46,7 +65,7 @@ def log_result(use_case_num, name, status, screenshots, notes, issues=None):
         print(f"ISSUES: {issues}")
     print(f"{'='*60}\n")
 
-def test_use_case_1(page):
+def test_use_case_1(page, base_url=BASE_URL):
     """Use Case 1: First Impression Flow"""
     screenshots = []
     issues = []
@@ -54,8 +73,8 @@ def test_use_case_1(page):
 
     try:
         # Land on homepage
-        page.goto(BASE_URL, wait_until="networkidle")
-        page.wait_for_timeout(2000)
+        waterfall.goto(page, base_url, wait_until="networkidle")
+        determinism.settle(page, 2000)
         screenshots.append(take_screenshot(page, "uc1_01_homepage"))
 
         # Check value proposition
@@ -74,24 +93,24 @@ def test_use_case_1(page):
             notes.append("Pricing link found")
             pricing_link.click()
             page.wait_for_load_state("networkidle")
-            page.wait_for_timeout(1000)
+            determinism.settle(page, 1000)
             screenshots.append(take_screenshot(page, "uc1_02_pricing_page"))
         elif convention_link.count() > 0 and convention_link.is_visible():
             notes.append("Convention link found (leads to pricing)")
             convention_link.click()
             page.wait_for_load_state("networkidle")
-            page.wait_for_timeout(1000)
+            determinism.settle(page, 1000)
             screenshots.append(take_screenshot(page, "uc1_02_convention_page"))
         else:
             # Try scrolling to find pricing
             page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            page.wait_for_timeout(1000)
+            determinism.settle(page, 1000)
             screenshots.append(take_screenshot(page, "uc1_02_scrolled"))
             notes.append("Scrolled to look for pricing section")
 
         # Look for signup/CTA button
-        page.goto(BASE_URL, wait_until="networkidle")
-        page.wait_for_timeout(1000)
+        waterfall.goto(page, base_url, wait_until="networkidle")
+        determinism.settle(page, 1000)
 
         # Try different CTA patterns
         cta_selectors = [
@@ -113,7 +132,7 @@ def test_use_case_1(page):
                 if cta.count() > 0 and cta.is_visible():
                     notes.append(f"CTA found: {cta.text_content()}")
                     cta.click()
-                    page.wait_for_timeout(2000)
+                    determinism.settle(page, 2000)
                     screenshots.append(take_screenshot(page, "uc1_03_cta_clicked"))
                     cta_found = True
                     break
@@ -132,7 +151,7 @@ def test_use_case_1(page):
         log_result(1, "First Impression Flow", "FAIL", screenshots, f"Error: {str(e)}", [str(e)])
         return "FAIL"
 
-def test_use_case_2(page):
+def test_use_case_2(page, base_url=BASE_URL):
     """Use Case 2: Convention Signup Flow"""
     screenshots = []
     issues = []
@@ -140,8 +159,8 @@ def test_use_case_2(page):
 
     try:
         # Navigate to /convention
-        page.goto(f"{BASE_URL}/convention", wait_until="networkidle")
-        page.wait_for_timeout(2000)
+        waterfall.goto(page, f"{base_url}/convention", wait_until="networkidle")
+        determinism.settle(page, 2000)
         screenshots.append(take_screenshot(page, "uc2_01_convention_page"))
 
         # Check if page loaded
@@ -169,7 +188,7 @@ def test_use_case_2(page):
 
         # Scroll to see full page
         page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-        page.wait_for_timeout(500)
+        determinism.settle(page, 500)
         screenshots.append(take_screenshot(page, "uc2_02_convention_scrolled"))
 
         # Look for signup form
@@ -206,57 +225,23 @@ def test_use_case_2(page):
         log_result(2, "Convention Signup Flow", "FAIL", screenshots, f"Error: {str(e)}", [str(e)])
         return "FAIL"
 
-def test_use_case_3(page):
+def test_use_case_3(page, base_url=BASE_URL):
     """Use Case 3: Demo Dashboard Experience"""
     screenshots = []
     issues = []
     notes = []
 
     try:
-        # Navigate to login
-        page.goto(f"{BASE_URL}/login", wait_until="networkidle")
-        page.wait_for_timeout(2000)
-        screenshots.append(take_screenshot(page, "uc3_01_login_page"))
-
-        # Check for login form
-        email_field = page.locator("input[type='email']").first
-        password_field = page.locator("input[type='password']").first
-
-        login_worked = False
-        if email_field.count() > 0 and password_field.count() > 0:
-            if email_field.is_visible() and password_field.is_visible():
-                notes.append("Login form found")
-                email_field.fill("demo@poolapp.com")
-                password_field.fill("demo123")
-                screenshots.append(take_screenshot(page, "uc3_02_login_filled"))
-
-                # Submit login
-                submit_btn = page.locator("button[type='submit']").first
-                if submit_btn.count() == 0:
-                    submit_btn = page.locator("button:has-text('Login'), button:has-text('Sign In')").first
-
-                if submit_btn.count() > 0 and submit_btn.is_visible():
-                    submit_btn.click()
-                    page.wait_for_timeout(3000)
-                    screenshots.append(take_screenshot(page, "uc3_03_after_login"))
-
-                    # Check if we're on dashboard
-                    if "/dashboard" in page.url:
-                        notes.append("Successfully reached dashboard via login")
-                        login_worked = True
-                    else:
-                        notes.append(f"Login redirect to: {page.url}")
-
-        if not login_worked:
-            # Try going directly to dashboard
-            page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
-            page.wait_for_timeout(2000)
-            screenshots.append(take_screenshot(page, "uc3_02_direct_dashboard"))
-            notes.append("Accessed dashboard directly (demo mode)")
-
-        # Check dashboard content
-        page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
-        page.wait_for_timeout(2000)
+        # The page starts from the saved demo session (auth_session.py), no login needed
+        waterfall.goto(page, f"{base_url}/dashboard", wait_until="networkidle")
+        determinism.settle(page, 2000)
+        screenshots.append(take_screenshot(page, "uc3_01_dashboard"))
+
+        demo_mode = page.evaluate(f"sessionStorage.getItem('{auth_session.DEMO_MODE_KEY}')")
+        if "/dashboard" in page.url and demo_mode == "true":
+            notes.append("Dashboard reached with saved demo session")
+        else:
+            issues.append(f"Demo session not active on {page.url}")
 
         # Look for revenue/savings stats
         stat_cards = page.locator("[class*='stat']").all()
@@ -296,12 +281,12 @@ def test_use_case_3(page):
         if len(tech_text) + len(util_text) + len(efficiency_text) > 0:
             notes.append("Tech/utilization content found")
 
-        screenshots.append(take_screenshot(page, "uc3_04_dashboard_content"))
+        screenshots.append(take_screenshot(page, "uc3_02_dashboard_content"))
 
         # Scroll to see more
         page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(500)
-        screenshots.append(take_screenshot(page, "uc3_05_dashboard_scrolled"))
+        determinism.settle(page, 500)
+        screenshots.append(take_screenshot(page, "uc3_03_dashboard_scrolled"))
 
         status = "PASS" if len(issues) == 0 else "PARTIAL"
         log_result(3, "Demo Dashboard Experience", status, screenshots, "; ".join(notes), issues)
@@ -312,7 +297,7 @@ def test_use_case_3(page):
         log_result(3, "Demo Dashboard Experience", "FAIL", screenshots, f"Error: {str(e)}", [str(e)])
         return "FAIL"
 
-def test_use_case_4(page):
+def test_use_case_4(page, base_url=BASE_URL):
     """Use Case 4: Route Optimization Demo"""
     screenshots = []
     issues = []
@@ -320,8 +305,8 @@ def test_use_case_4(page):
 
     try:
         # Navigate to routes page
-        page.goto(f"{BASE_URL}/routes", wait_until="networkidle")
-        page.wait_for_timeout(2000)
+        waterfall.goto(page, f"{base_url}/routes", wait_until="networkidle")
+        determinism.settle(page, 2000)
         screenshots.append(take_screenshot(page, "uc4_01_routes_page"))
 
         # Check for 404
@@ -374,11 +359,11 @@ def test_use_case_4(page):
 
         # Scroll to see more content
         page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-        page.wait_for_timeout(500)
+        determinism.settle(page, 500)
         screenshots.append(take_screenshot(page, "uc4_02_routes_scrolled"))
 
         page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(500)
+        determinism.settle(page, 500)
         screenshots.append(take_screenshot(page, "uc4_03_routes_bottom"))
 
         status = "PASS" if len(issues) == 0 else "PARTIAL" if len(issues) < 2 else "FAIL"
@@ -390,7 +375,7 @@ def test_use_case_4(page):
         log_result(4, "Route Optimization Demo", "FAIL", screenshots, f"Error: {str(e)}", [str(e)])
         return "FAIL"
 
-def test_use_case_5(page):
+def test_use_case_5(page, base_url=BASE_URL):
     """Use Case 5: Customer Management Demo"""
     screenshots = []
     issues = []
@@ -398,8 +383,8 @@ def test_use_case_5(page):
 
     try:
         # Navigate to customers page
-        page.goto(f"{BASE_URL}/customers", wait_until="networkidle")
-        page.wait_for_timeout(2000)
+        waterfall.goto(page, f"{base_url}/customers", wait_until="networkidle")
+        determinism.settle(page, 2000)
         screenshots.append(take_screenshot(page, "uc5_01_customers_page"))
 
         # Check for 404
@@ -449,7 +434,7 @@ def test_use_case_5(page):
         if customer_link.count() > 0 and customer_link.is_visible():
             original_url = page.url
             customer_link.click()
-            page.wait_for_timeout(2000)
+            determinism.settle(page, 2000)
             screenshots.append(take_screenshot(page, "uc5_02_customer_detail"))
 
             if page.url != original_url:
@@ -468,7 +453,7 @@ def test_use_case_5(page):
         log_result(5, "Customer Management Demo", "FAIL", screenshots, f"Error: {str(e)}", [str(e)])
         return "FAIL"
 
-def test_use_case_6(page):
+def test_use_case_6(page, base_url=BASE_URL):
     """Use Case 6: Invoice Demo"""
     screenshots = []
     issues = []
@@ -476,8 +461,8 @@ def test_use_case_6(page):
 
     try:
         # Navigate to invoices page
-        page.goto(f"{BASE_URL}/invoices", wait_until="networkidle")
-        page.wait_for_timeout(2000)
+        waterfall.goto(page, f"{base_url}/invoices", wait_until="networkidle")
+        determinism.settle(page, 2000)
         screenshots.append(take_screenshot(page, "uc6_01_invoices_page"))
 
         # Check for 404
@@ -522,7 +507,7 @@ def test_use_case_6(page):
 
         # Scroll to see more
         page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(500)
+        determinism.settle(page, 500)
         screenshots.append(take_screenshot(page, "uc6_02_invoices_scrolled"))
 
         status = "PASS" if len(issues) == 0 else "PARTIAL" if len(issues) < 2 else "FAIL"
@@ -534,23 +519,26 @@ def test_use_case_6(page):
         log_result(6, "Invoice Demo", "FAIL", screenshots, f"Error: {str(e)}", [str(e)])
         return "FAIL"
 
-def test_use_case_7(page, browser):
+def test_use_case_7(page, browser, base_url=BASE_URL):
     """Use Case 7: Mobile Experience"""
     screenshots = []
     issues = []
     notes = []
 
     try:
-        # Create mobile context
-        mobile_context = browser.new_context(
+        # Create mobile context, logged in for the dashboard check
+        mobile_context = auth_session.new_context(
+            browser,
+            base_url,
             viewport={"width": 375, "height": 812},
             user_agent="Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15"
         )
+        determinism.apply(mobile_context)
         mobile_page = mobile_context.new_page()
 
         # Test homepage on mobile
-        mobile_page.goto(BASE_URL, wait_until="networkidle")
-        mobile_page.wait_for_timeout(2000)
+        waterfall.goto(mobile_page, base_url, wait_until="networkidle")
+        determinism.settle(mobile_page, 2000)
         screenshots.append(take_screenshot(mobile_page, "uc7_01_mobile_homepage"))
 
         # Check for hamburger menu or mobile nav
@@ -569,7 +557,7 @@ def test_use_case_7(page, browser):
             notes.append("Mobile navigation menu found")
             try:
                 mobile_nav.click()
-                mobile_page.wait_for_timeout(500)
+                determinism.settle(mobile_page, 500)
                 screenshots.append(take_screenshot(mobile_page, "uc7_02_mobile_nav_open"))
             except:
                 notes.append("Mobile nav click failed")
@@ -580,8 +568,8 @@ def test_use_case_7(page, browser):
                 notes.append(f"Navigation visible on mobile ({len(nav_links)} links)")
 
         # Test dashboard on mobile
-        mobile_page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
-        mobile_page.wait_for_timeout(2000)
+        waterfall.goto(mobile_page, f"{base_url}/dashboard", wait_until="networkidle")
+        determinism.settle(mobile_page, 2000)
         screenshots.append(take_screenshot(mobile_page, "uc7_03_mobile_dashboard"))
 
         # Check touch target sizes (buttons should be at least 44x44)
@@ -601,13 +589,13 @@ def test_use_case_7(page, browser):
             notes.append("Touch targets appear adequate")
 
         # Test routes on mobile
-        mobile_page.goto(f"{BASE_URL}/routes", wait_until="networkidle")
-        mobile_page.wait_for_timeout(2000)
+        waterfall.goto(mobile_page, f"{base_url}/routes", wait_until="networkidle")
+        determinism.settle(mobile_page, 2000)
         screenshots.append(take_screenshot(mobile_page, "uc7_04_mobile_routes"))
 
         # Test convention page on mobile
-        mobile_page.goto(f"{BASE_URL}/convention", wait_until="networkidle")
-        mobile_page.wait_for_timeout(2000)
+        waterfall.goto(mobile_page, f"{base_url}/convention", wait_until="networkidle")
+        determinism.settle(mobile_page, 2000)
         screenshots.append(take_screenshot(mobile_page, "uc7_05_mobile_convention"))
 
         # Verify text is readable
@@ -624,7 +612,7 @@ def test_use_case_7(page, browser):
         log_result(7, "Mobile Experience", "FAIL", screenshots, f"Error: {str(e)}", [str(e)])
         return "FAIL"
 
-def test_use_case_8(page):
+def test_use_case_8(page, base_url=BASE_URL):
     """Use Case 8: QR Code Flow"""
     screenshots = []
     issues = []
@@ -632,8 +620,8 @@ def test_use_case_8(page):
 
     try:
         # Navigate to QR page
-        page.goto(f"{BASE_URL}/qr", wait_until="networkidle")
-        page.wait_for_timeout(2000)
+        waterfall.goto(page, f"{base_url}/qr", wait_until="networkidle")
+        determinism.settle(page, 2000)
         screenshots.append(take_screenshot(page, "uc8_01_qr_page"))
 
         # Check for 404
@@ -676,7 +664,7 @@ def test_use_case_8(page):
 
         # Scroll to see full page
         page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(500)
+        determinism.settle(page, 500)
         screenshots.append(take_screenshot(page, "uc8_02_qr_scrolled"))
 
         status = "PASS" if len(issues) == 0 else "PARTIAL" if len(issues) < 2 else "FAIL"
@@ -688,29 +676,64 @@ def test_use_case_8(page):
         log_result(8, "QR Code Flow", "FAIL", screenshots, f"Error: {str(e)}", [str(e)])
         return "FAIL"
 
+# (use case number, name, test) for the use cases that need the demo session
+LOGGED_IN_USE_CASES = [
+    (3, "Demo Dashboard Experience", test_use_case_3),
+    (4, "Route Optimization Demo", test_use_case_4),
+    (5, "Customer Management Demo", test_use_case_5),
+    (6, "Invoice Demo", test_use_case_6),
+]
+
+def run_logged_in(use_case_num, name, test, browser, base_url=BASE_URL):
+    """Run a dashboard use case in its own context restored from the saved demo session"""
+    try:
+        context = auth_session.new_context(browser, base_url, viewport={"width": 1280, "height": 720})
+    except Exception as e:
+        log_result(use_case_num, name, "FAIL", [], f"Error: demo login failed: {str(e)}", [str(e)])
+        return "FAIL"
+    determinism.apply(context)
+    try:
+        return test(context.new_page(), base_url)
+    finally:
+        context.close()
+
+def run_use_cases(page, browser, base_url=BASE_URL):
+    """Run all use cases against base_url and return their statuses"""
+    statuses = []
+    statuses.append(test_use_case_1(page, base_url))
+    statuses.append(test_use_case_2(page, base_url))
+    # Dashboard use cases each start from the same saved session, independent of order
+    for use_case_num, name, test in LOGGED_IN_USE_CASES:
+        statuses.append(run_logged_in(use_case_num, name, test, browser, base_url))
+    statuses.append(test_use_case_7(page, browser, base_url))
+    statuses.append(test_use_case_8(page, base_url))
+    return statuses
+
 def main():
     """Run all E2E tests"""
+    parser = argparse.ArgumentParser(description="PoolApp E2E test suite")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="Virtual clock, frozen animations and seeded random for reproducible screenshots")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Save this run's per-route JS sizes as the bundle regression baseline")
+    args = parser.parse_args()
+    determinism.enable(args.deterministic)
+    results["deterministic"] = args.deterministic
+
     print("\n" + "="*60)
     print("POOLAPP E2E TEST SUITE - CONVENTION PRE-LAUNCH QA")
     print(f"Testing: {BASE_URL}")
     print(f"Started: {datetime.now().isoformat()}")
+    if args.deterministic:
+        print(f"Deterministic mode: clock frozen at {determinism.FROZEN_TIME.isoformat()}")
     print("="*60 + "\n")
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
-        context = browser.new_context(viewport={"width": 1280, "height": 720})
+        context = determinism.apply(browser.new_context(viewport={"width": 1280, "height": 720}))
         page = context.new_page()
 
-        # Run all use cases
-        statuses = []
-        statuses.append(test_use_case_1(page))
-        statuses.append(test_use_case_2(page))
-        statuses.append(test_use_case_3(page))
-        statuses.append(test_use_case_4(page))
-        statuses.append(test_use_case_5(page))
-        statuses.append(test_use_case_6(page))
-        statuses.append(test_use_case_7(page, browser))
-        statuses.append(test_use_case_8(page))
+        statuses = run_use_cases(page, browser)
 
         browser.close()
 
@@ -734,6 +757,14 @@ def main():
         "total": 8
     }
 
+    # Request waterfall for every page visited
+    report = waterfall.save_report(f"{SCREENSHOT_DIR}/../waterfall.json")
+    results["bundle_regressions"] = report["regressions"]
+    if report["regressions"]:
+        print(f"WARNING: {len(report['regressions'])} bundle regressions detected!")
+    if args.update_baseline:
+        print(f"Bundle baseline saved to {waterfall.save_baseline(report)}")
+
     # Save results to JSON
     with open(f"{SCREENSHOT_DIR}/../results.json", "w") as f:
         json.dump(results, f, indent=2)
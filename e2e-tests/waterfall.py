@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+PoolApp Request Waterfall Analyzer
+Captures the request waterfall for every page visited through goto() and
+reports render-blocking resources, duplicate or uncompressed responses and
+oversized JS chunks per Next.js route group.
+"""
+
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+from urllib.parse import unquote, urlparse
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "waterfall_baseline.json")
+
+# Budgets (compressed transfer sizes)
+CHUNK_BUDGET_KB = 100
+ROUTE_JS_BUDGET_KB = 400
+# Growth over the baseline that counts as a bundle regression
+REGRESSION_TOLERANCE = 0.10
+# Text responses smaller than this are not worth compressing
+MIN_COMPRESSIBLE_BYTES = 1024
+TOP_OFFENDERS = 5
+
+COMPRESSIBLE_TYPES = ("javascript", "css", "html", "json", "svg", "text/", "xml")
+
+RESOURCE_TIMING_SCRIPT = """
+() => {
+  const pick = (e) => ({
+    url: e.name,
+    initiator_type: e.initiatorType,
+    start_ms: e.startTime,
+    end_ms: e.responseEnd,
+    transfer_size: e.transferSize,
+    encoded_size: e.encodedBodySize,
+    decoded_size: e.decodedBodySize,
+    render_blocking: e.renderBlockingStatus === 'blocking',
+  });
+  const nav = performance.getEntriesByType('navigation')[0];
+  const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+  return {
+    document: nav ? Object.assign(pick(nav), {
+      ttfb_ms: nav.responseStart,
+      fcp_ms: fcp ? fcp.startTime : null,
+      dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+      load_ms: nav.loadEventEnd,
+    }) : null,
+    resources: performance.getEntriesByType('resource').map(pick),
+  };
+}
+"""
+
+navigations = []
+_recorders = {}
+
+def route_group_map():
+    """Map first URL segments to the app/ route group that serves them"""
+    groups = {}
+    if not os.path.isdir(APP_DIR):
+        return groups
+    for entry in os.listdir(APP_DIR):
+        if entry.startswith("(") and entry.endswith(")"):
+            for child in os.listdir(os.path.join(APP_DIR, entry)):
+                if os.path.isdir(os.path.join(APP_DIR, entry, child)):
+                    groups[child] = entry
+    return groups
+
+ROUTE_GROUPS = route_group_map()
+
+def route_group_for_path(path):
+    """Return the route group for a page path, e.g. /customers -> (dashboard)"""
+    segment = path.strip("/").split("/")[0]
+    return ROUTE_GROUPS.get(segment, "(root)")
+
+def chunk_route_group(url):
+    """Return the route group a Next.js JS chunk belongs to, or 'shared'"""
+    path = unquote(urlparse(url).path)
+    marker = "/_next/static/chunks/app/"
+    if marker not in path:
+        return "shared"
+    rest = path.split(marker, 1)[1]
+    if rest.startswith("("):
+        return rest.split("/", 1)[0]
+    return "(root)"
+
+class WaterfallRecorder:
+    """Buffers response headers for a page between goto() captures"""
+
+    def __init__(self, page):
+        self.page = page
+        self.responses = []
+        self.visits = Counter()
+        self.initiators = {}
+        page.on("response", self._on_response)
+        try:
+            cdp = page.context.new_cdp_session(page)
+            cdp.on("Network.requestWillBeSent", self._on_request_will_be_sent)
+            cdp.send("Network.enable")
+        except Exception:
+            # Not Chromium: critical chains hang everything off the document
+            pass
+
+    def _on_request_will_be_sent(self, event):
+        initiator = event.get("initiator") or {}
+        url = initiator.get("url")
+        # Script-initiated requests carry a stack instead; async ones only in a parent stack
+        stack = initiator.get("stack")
+        while stack and not url:
+            frames = stack.get("callFrames") or []
+            url = frames[0]["url"] if frames else None
+            stack = stack.get("parent")
+        self.initiators.setdefault(event["request"]["url"], url or None)
+
+    def _on_response(self, response):
+        headers = response.headers
+        self.responses.append({
+            "url": response.url,
+            "status": response.status,
+            "resource_type": response.request.resource_type,
+            "content_type": headers.get("content-type", ""),
+            "content_encoding": headers.get("content-encoding", ""),
+            "content_length": int(headers.get("content-length") or 0),
+        })
+
+    def capture(self, url):
+        """Build the waterfall for the navigation that just finished"""
+        timing = self.page.evaluate(RESOURCE_TIMING_SCRIPT)
+        by_url = {}
+        for response in self.responses:
+            by_url.setdefault(response["url"], response)
+
+        requests = []
+        for entry in ([timing["document"]] if timing["document"] else []) + timing["resources"]:
+            response = by_url.get(entry["url"], {})
+            requests.append({
+                **entry,
+                **{k: v for k, v in response.items() if k != "url"},
+                "initiator_url": self.initiators.get(entry["url"]),
+            })
+
+        path = urlparse(url).path or "/"
+        self.visits[path] += 1
+        viewport = self.page.viewport_size or {}
+        navigation = {
+            "url": url,
+            "path": path,
+            # Repeat visits in the same page run on a warm cache; mobile runs use another viewport
+            "visit": self.visits[path],
+            "viewport": f"{viewport.get('width')}x{viewport.get('height')}",
+            "route_group": route_group_for_path(urlparse(url).path),
+            "requests": requests,
+            "response_counts": Counter(r["url"] for r in self.responses),
+            "ttfb_ms": (timing["document"] or {}).get("ttfb_ms"),
+            "fcp_ms": (timing["document"] or {}).get("fcp_ms"),
+            "dom_content_loaded_ms": (timing["document"] or {}).get("dom_content_loaded_ms"),
+            "load_ms": (timing["document"] or {}).get("load_ms"),
+            "transfer_kb": round(sum(r.get("transfer_size") or 0 for r in requests) / 1024, 1),
+        }
+        self.responses = []
+        return navigation
+
+def goto(page, url, **kwargs):
+    """page.goto() that records the request waterfall of the navigation"""
+    recorder = _recorders.get(page)
+    if recorder is None:
+        recorder = _recorders[page] = WaterfallRecorder(page)
+        # Forget closed pages so long runs (compare_targets.py) do not keep them alive
+        page.on("close", lambda closed: _recorders.pop(closed, None))
+    recorder.responses = []
+    recorder.initiators = {}
+    response = page.goto(url, **kwargs)
+    try:
+        navigations.append(recorder.capture(url))
+    except Exception as e:
+        print(f"Waterfall capture failed for {url}: {e}")
+    return response
+
+def _size(request):
+    return request.get("transfer_size") or request.get("content_length") or request.get("encoded_size") or 0
+
+def _is_script(request):
+    return request.get("resource_type") == "script" or (
+        request.get("initiator_type") == "script" and urlparse(request["url"]).path.endswith(".js")
+    )
+
+def critical_chain(navigation):
+    """Longest dependency path through the requests the page waits on before DOMContentLoaded
+
+    Critical scripts, stylesheets and fonts hang off the request that
+    initiated them (CDP Network.requestWillBeSent); parser-discovered ones and
+    any whose initiator is unknown hang off the document. The reported chain
+    is the branch that finishes last, document first, and late_discovered
+    lists critical requests some other script had to request first.
+    """
+    requests = navigation["requests"]
+    if not requests:
+        return {"chain": [], "duration_ms": 0, "depth": 0, "late_discovered": []}
+    document = requests[0]
+    dcl = navigation["dom_content_loaded_ms"] or 0
+    critical = {document["url"]: document}
+    for request in requests[1:]:
+        critical_type = request.get("resource_type") in ("script", "stylesheet", "font") or request["render_blocking"]
+        if critical_type and request["start_ms"] <= dcl:
+            critical.setdefault(request["url"], request)
+
+    def parent(request):
+        initiator = request.get("initiator_url")
+        if initiator in critical and initiator != request["url"]:
+            return critical[initiator]
+        return None if request is document else document
+
+    leaf = max(critical.values(), key=lambda r: r["end_ms"])
+    branch, node, seen = [], leaf, set()
+    while node is not None and node["url"] not in seen:
+        seen.add(node["url"])
+        branch.append(node)
+        node = parent(node)
+    branch.reverse()
+
+    return {
+        "chain": [
+            {
+                "url": r["url"],
+                "initiator": r.get("initiator_url"),
+                "start_ms": round(r["start_ms"], 1),
+                "end_ms": round(r["end_ms"], 1),
+                "bytes": _size(r),
+            }
+            for r in branch
+        ],
+        "duration_ms": round(leaf["end_ms"], 1),
+        "depth": len(branch) - 1,
+        "late_discovered": [
+            r["url"] for r in critical.values()
+            if r is not document and parent(r) is not document
+        ],
+    }
+
+def analyze_navigation(navigation):
+    """Find the offenders in a single navigation"""
+    requests = navigation["requests"]
+    render_blocking = [
+        {"url": r["url"], "type": r.get("resource_type") or r["initiator_type"], "duration_ms": round(r["end_ms"] - r["start_ms"], 1)}
+        for r in requests if r["render_blocking"]
+    ]
+    duplicates = [
+        {"url": url, "count": count}
+        for url, count in navigation["response_counts"].items() if count > 1
+    ]
+    uncompressed = [
+        {"url": r["url"], "bytes": _size(r), "content_type": r["content_type"]}
+        for r in requests
+        if r.get("content_type")
+        and any(t in r["content_type"] for t in COMPRESSIBLE_TYPES)
+        and not r.get("content_encoding")
+        and (r.get("decoded_size") or r.get("content_length") or 0) >= MIN_COMPRESSIBLE_BYTES
+        and r.get("status") != 304
+    ]
+    scripts = [r for r in requests if _is_script(r)]
+    oversized = [
+        {"url": r["url"], "kb": round(_size(r) / 1024, 1), "route_group": chunk_route_group(r["url"])}
+        for r in scripts if _size(r) > CHUNK_BUDGET_KB * 1024
+    ]
+    js_by_group = defaultdict(int)
+    for r in scripts:
+        js_by_group[chunk_route_group(r["url"])] += _size(r)
+
+    return {
+        "url": navigation["url"],
+        "path": navigation["path"],
+        "route_group": navigation["route_group"],
+        "request_count": len(requests),
+        "dom_content_loaded_ms": navigation["dom_content_loaded_ms"],
+        "load_ms": navigation["load_ms"],
+        "critical_chain": critical_chain(navigation),
+        "render_blocking": render_blocking,
+        "duplicates": duplicates,
+        "uncompressed": uncompressed,
+        "oversized_chunks": sorted(oversized, key=lambda c: -c["kb"]),
+        "js_kb": round(sum(js_by_group.values()) / 1024, 1),
+        "js_kb_by_chunk_group": {k: round(v / 1024, 1) for k, v in js_by_group.items()},
+    }
+
+def build_report(baseline_path=BASELINE_PATH):
+    """Machine-readable waterfall report for every captured navigation"""
+    pages = [analyze_navigation(n) for n in navigations]
+
+    routes = {}
+    for page in pages:
+        route = routes.setdefault(page["path"], {
+            "route_group": page["route_group"],
+            "visits": 0,
+            "js_kb": 0,
+            "offenders": [],
+        })
+        route["visits"] += 1
+        route["js_kb"] = max(route["js_kb"], page["js_kb"])
+        for item in page["render_blocking"]:
+            route["offenders"].append({"kind": "render-blocking", "url": item["url"], "cost": item["duration_ms"], "unit": "ms"})
+        for item in page["uncompressed"]:
+            route["offenders"].append({"kind": "uncompressed", "url": item["url"], "cost": round(item["bytes"] / 1024, 1), "unit": "KB"})
+        for item in page["oversized_chunks"]:
+            route["offenders"].append({"kind": "oversized-chunk", "url": item["url"], "cost": item["kb"], "unit": "KB"})
+        for item in page["duplicates"]:
+            route["offenders"].append({"kind": "duplicate", "url": item["url"], "cost": item["count"], "unit": "x"})
+
+    # Costs are only comparable within a kind, so rank each kind separately
+    for route in routes.values():
+        unique = {(o["kind"], o["url"]): o for o in route["offenders"]}
+        ranked = sorted(unique.values(), key=lambda o: -o["cost"])
+        route["offenders"] = {
+            kind: [o for o in ranked if o["kind"] == kind][:TOP_OFFENDERS]
+            for kind in sorted({o["kind"] for o in ranked})
+        }
+
+    oversized_by_group = defaultdict(list)
+    for page in pages:
+        for chunk in page["oversized_chunks"]:
+            if chunk["url"] not in {c["url"] for c in oversized_by_group[chunk["route_group"]]}:
+                oversized_by_group[chunk["route_group"]].append(chunk)
+
+    regressions = []
+    for path, route in routes.items():
+        if route["js_kb"] > ROUTE_JS_BUDGET_KB:
+            regressions.append(f"{path}: {route['js_kb']} KB JS exceeds the {ROUTE_JS_BUDGET_KB} KB budget")
+    baseline = load_baseline(baseline_path)
+    for path, route in routes.items():
+        previous = baseline.get(path)
+        if previous and route["js_kb"] > previous * (1 + REGRESSION_TOLERANCE):
+            regressions.append(f"{path}: JS grew from {previous} KB to {route['js_kb']} KB")
+
+    return {
+        "budgets": {
+            "chunk_kb": CHUNK_BUDGET_KB,
+            "route_js_kb": ROUTE_JS_BUDGET_KB,
+            "regression_tolerance": REGRESSION_TOLERANCE,
+        },
+        "pages": pages,
+        "routes": routes,
+        "oversized_chunks_by_route_group": dict(oversized_by_group),
+        "regressions": regressions,
+        "baseline": baseline_path if baseline else None,
+    }
+
+def load_baseline(path):
+    """Per-route JS sizes from a previous run, {path: js_kb}"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(report, path=BASELINE_PATH):
+    """Record the current per-route JS sizes as the new baseline"""
+    with open(path, "w") as f:
+        json.dump({p: r["js_kb"] for p, r in report["routes"].items()}, f, indent=2, sort_keys=True)
+    return path
+
+def print_summary(report):
+    """Per-route top offenders"""
+    print("\n" + "="*60)
+    print("REQUEST WATERFALL - TOP OFFENDERS")
+    print("="*60)
+    for path, route in sorted(report["routes"].items()):
+        print(f"{path} {route['route_group']} - {route['js_kb']} KB JS")
+        for kind, offenders in route["offenders"].items():
+            for offender in offenders:
+                print(f"  [{kind}] {offender['cost']}{offender['unit']} {offender['url'][:90]}")
+    for group, chunks in sorted(report["oversized_chunks_by_route_group"].items()):
+        print(f"Oversized chunks in {group}: {len(chunks)}")
+    if not report.get("baseline"):
+        print("\nNo bundle baseline yet, so JS growth was not checked (record one with --update-baseline)")
+    if report["regressions"]:
+        print("\nBUNDLE REGRESSIONS:")
+        for regression in report["regressions"]:
+            print(f"  {regression}")
+    print("="*60 + "\n")
+
+def save_report(path):
+    """Build, save and summarize the waterfall report"""
+    report = build_report()
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print_summary(report)
+    print(f"Waterfall report saved to {path}")
+    return report
+
+if __name__ == "__main__":
+    # Re-summarize a saved report: python waterfall.py waterfall.json [--update-baseline]
+    with open(sys.argv[1]) as f:
+        saved = json.load(f)
+    print_summary(saved)
+    if "--update-baseline" in sys.argv:
+        print(f"Baseline saved to {save_baseline(saved)}")